@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+import argparse
+from cbsizerhelper.lib.codec import CODECS, get_codec
+from cbsizerhelper.lib.convert import ConvertOptions, convert
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+
+SCALES = (1, 4, 16)
+ROUNDS = 5
+
+
+def spec_for(scale: int) -> CaptureSpec:
+    return CaptureSpec(nodes=4, buckets=2 * scale, scopes=4, collections=16, indexes=4, partitions=2, replicas=1)
+
+
+def best_of(func, rounds: int) -> float:
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def normalize(text: str) -> str:
+    return json.dumps(json.loads(text), indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', action='store', help="Timing rounds per measurement", type=int, default=ROUNDS)
+    args = parser.parse_args()
+
+    backends = [get_codec(name) for name, codec_class in CODECS.items() if codec_class.available()]
+    reference = get_codec("stdlib")
+    failures = []
+
+    print(f"{'scale':>6} {'backend':<8} {'input MiB':>10} {'decode MiB/s':>13} {'encode MiB/s':>13} {'compact MiB/s':>14} {'identical':>10}")
+    for scale in SCALES:
+        text = json.dumps(CaptureGenerator(spec_for(scale)).generate())
+        document = convert([json.loads(text)], ConvertOptions(threads=1))
+        expected = reference.dumps(document)
+        expected_compact = reference.dumps(document, compact=True)
+        size = len(text) / 1048576
+        output_size = len(expected) / 1048576
+        compact_size = len(expected_compact) / 1048576
+        for codec in backends:
+            decode = best_of(lambda: codec.loads(text), args.rounds)
+            encode = best_of(lambda: codec.dumps(document), args.rounds)
+            compact = best_of(lambda: codec.dumps(document, compact=True), args.rounds)
+            output = codec.dumps(document)
+            output_compact = codec.dumps(document, compact=True)
+            identical = output == expected and output_compact == expected_compact
+            if not identical and normalize(output) != normalize(expected):
+                failures.append(f"scale {scale}: {codec.name} output differs from stdlib")
+            print(f"{scale:>6} {codec.name:<8} {size:>10.2f} {size / decode:>13.1f} {output_size / encode:>13.1f} {compact_size / compact:>14.1f} "
+                  f"{'yes' if identical else 'normalized':>10}")
+
+    for failure in failures:
+        print(f"MISMATCH: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
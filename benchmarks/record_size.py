@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import attr
+import tracemalloc
+from cbsizerhelper.lib.sizing import ClusterConfigData, ClusterConfigCollections, ClusterConfigIndexes
+
+current = os.path.dirname(os.path.realpath(__file__))
+sample_path = os.path.join(current, '..', 'tests', 'sample_data.json')
+RECORDS = 10000
+
+
+def dict_backed(record_class: type) -> type:
+    fields = {f.name: attr.ib(default=f.default) for f in attr.fields(record_class)}
+    return attr.make_class(f"{record_class.__name__}Dict", fields, slots=False)
+
+
+def bytes_per_record(record_class: type, values: tuple) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [record_class(*values) for _ in range(RECORDS)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return (after - before) / RECORDS
+
+
+def main():
+    with open(sample_path, 'r') as input_file:
+        data = json.load(input_file)
+    collection = {"bucket": "b", "scope_name": "s", "collection_name": "c", "node": "n", "mem_used": 0, "data_size": 0, "items": 0, "ops_delete": 0, "ops_get": 0, "ops_store": 0}
+    samples = [
+        (ClusterConfigData, ClusterConfigData.from_config(data["data"][0])),
+        (ClusterConfigCollections, ClusterConfigCollections.from_config(collection)),
+        (ClusterConfigIndexes, ClusterConfigIndexes.from_config(data["indexes"][0])),
+    ]
+    print(f"{'record':<28} {'dict':>10} {'slots':>10}")
+    for record_class, record in samples:
+        values = attr.astuple(record, recurse=False)
+        before = bytes_per_record(dict_backed(record_class), values)
+        after = bytes_per_record(record_class, values)
+        print(f"{record_class.__name__:<28} {before:>10.1f} {after:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
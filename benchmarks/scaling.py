@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import tempfile
+from cbsizerhelper.lib.convert import ConvertOptions, convert
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from cbsizerhelper.lib.profile import PhaseProfiler
+
+current = os.path.dirname(os.path.realpath(__file__))
+baseline_path = os.path.join(current, 'baseline.json')
+PROCESS_PHASES = ("from_config", "keyspace_aggregation", "index_grouping", "service_assembly")
+SCALES = (1, 2, 4, 8)
+SLOPE_LIMIT = 1.25
+THROUGHPUT_TOLERANCE = 0.75
+REFERENCE_ROUNDS = 5
+
+
+def spec_for(scale: int) -> CaptureSpec:
+    return CaptureSpec(nodes=4, buckets=2 * scale, scopes=4, collections=16, indexes=4, partitions=2, replicas=1)
+
+
+def reference_rate() -> float:
+    text = json.dumps(CaptureGenerator(spec_for(1)).generate())
+    best = None
+    for _ in range(REFERENCE_ROUNDS):
+        start = time.perf_counter()
+        json.dumps(json.loads(text))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(text) / best
+
+
+def run(input_file: str, trace_memory: bool) -> PhaseProfiler:
+    profiler = PhaseProfiler(trace_memory=trace_memory)
+    convert([input_file], ConvertOptions(), profiler)
+    profiler.stop()
+    return profiler
+
+
+def measure(scale: int, work_dir: str) -> dict:
+    spec = spec_for(scale)
+    input_file = os.path.join(work_dir, f"capture_{scale}.json")
+    CaptureGenerator(spec).write(input_file)
+    records = spec.collection_rows + spec.index_rows
+
+    timing = run(input_file, False).as_dict
+    memory = run(input_file, True).as_dict
+    seconds = sum(timing[p]["wall_time"] for p in PROCESS_PHASES)
+    return {
+        "scale": scale,
+        "records": records,
+        "seconds": seconds,
+        "records_per_sec": records / seconds,
+        "peak_memory": max(memory[p]["peak_memory"] for p in PROCESS_PHASES),
+    }
+
+
+def slope(results: list[dict]) -> float:
+    xs = [math.log(r["records"]) for r in results]
+    ys = [math.log(r["seconds"]) for r in results]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sum((x - x_mean) ** 2 for x in xs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--update-baseline', action='store_true', help="Store the results as the new baseline")
+    args = parser.parse_args()
+
+    reference = reference_rate()
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = [measure(scale, work_dir) for scale in SCALES]
+    for r in results:
+        r["relative"] = r["records_per_sec"] / reference * 1048576
+
+    growth = slope(results)
+    print(f"{'scale':>6} {'records':>10} {'seconds':>10} {'records/s':>12} {'per ref MiB':>12} {'peak MiB':>10}")
+    for r in results:
+        print(f"{r['scale']:>6} {r['records']:>10} {r['seconds']:>10.3f} {r['records_per_sec']:>12.0f} {r['relative']:>12.0f} {r['peak_memory'] / 1048576:>10.1f}")
+    print(f"time growth exponent: {growth:.2f}")
+
+    if args.update_baseline:
+        with open(baseline_path, 'w') as baseline_file:
+            json.dump({"host": platform.node(), "reference": reference, "slope": growth, "results": results}, baseline_file, indent=2)
+            baseline_file.write("\n")
+        print(f"baseline written to {baseline_path}")
+        return
+
+    failures = []
+    if growth > SLOPE_LIMIT:
+        failures.append(f"super-linear growth: exponent {growth:.2f} > {SLOPE_LIMIT}")
+    if os.path.exists(baseline_path):
+        with open(baseline_path, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+        for r, b in zip(results, baseline["results"]):
+            if "relative" not in b:
+                continue
+            if r["relative"] < b["relative"] * THROUGHPUT_TOLERANCE:
+                failures.append(f"scale {r['scale']}: {r['relative']:.0f} records per reference MiB is below baseline {b['relative']:.0f}")
+        if growth > baseline["slope"] + 0.2:
+            failures.append(f"growth exponent {growth:.2f} exceeds baseline {baseline['slope']:.2f}")
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
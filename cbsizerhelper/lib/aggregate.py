@@ -0,0 +1,114 @@
+##
+##
+
+import re
+import attr
+from attr.validators import instance_of as io
+from cbsizerhelper.lib.sizing import ClusterConfigCollections, ClusterConfigIndexes
+
+REPLICA_SUFFIX = re.compile(r"\s*\(replica \d+\)$")
+
+
+@attr.s
+class KeyspaceAggregate(object):
+    buckets = attr.ib(validator=io(dict))
+
+    @classmethod
+    def build(cls):
+        return cls(
+            {}
+        )
+
+    @classmethod
+    def from_config(cls, collections: list[ClusterConfigCollections]):
+        aggregate = cls.build()
+        for record in collections:
+            aggregate.add(record)
+        return aggregate
+
+    @classmethod
+    def from_columns(cls, collections):
+        aggregate = cls.build()
+        bucket, scope, collection = collections.column("bucket"), collections.column("scope_name"), collections.column("collection_name")
+        totals = {}
+        for key, items in zip(zip(bucket.keys(), scope.keys(), collection.keys()), collections.column("items").to_list()):
+            totals[key] = totals.get(key, 0) + items
+        for (b, s, c), items in totals.items():
+            aggregate.buckets.setdefault(bucket.value(b), {}).setdefault(scope.value(s), {})[collection.value(c)] = items
+        return aggregate
+
+    def add(self, record: ClusterConfigCollections):
+        scopes = self.buckets.get(record.bucket)
+        if scopes is None:
+            scopes = self.buckets[record.bucket] = {}
+        collections = scopes.get(record.scope_name)
+        if collections is None:
+            collections = scopes[record.scope_name] = {}
+        collections[record.collection_name] = collections.get(record.collection_name, 0) + record.items
+        return self
+
+    def scopes(self, bucket: str) -> list[str]:
+        return list(self.buckets.get(bucket, {}).keys())
+
+    def collections(self, bucket: str, scope: str) -> list[tuple[str, int]]:
+        return list(self.buckets.get(bucket, {}).get(scope, {}).items())
+
+    def items(self, bucket: str, scope: str, collection: str) -> int:
+        return self.buckets.get(bucket, {}).get(scope, {}).get(collection, 0)
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+@attr.s
+class IndexReplicaMap(object):
+    replicas = attr.ib(validator=io(dict))
+
+    @classmethod
+    def build(cls):
+        return cls(
+            {}
+        )
+
+    @classmethod
+    def from_config(cls, indexes: list[ClusterConfigIndexes]):
+        replica_map = cls.build()
+        for record in indexes:
+            if record.replicaId > 0:
+                replica_map.add(record)
+        return replica_map
+
+    @classmethod
+    def from_columns(cls, indexes):
+        replica_map = cls.build()
+        columns = [indexes.column(name) for name in ("bucket", "scope", "collection", "indexName")]
+        names = {}
+        for key, replica_id in zip(zip(*(column.keys() for column in columns)), indexes.column("replicaId").to_list()):
+            if not replica_id > 0:
+                continue
+            name = names.get(key)
+            if name is None:
+                bucket, scope, collection, index_name = (column.value(k) for column, k in zip(columns, key))
+                name = names[key] = (bucket, scope, collection, cls.base_name(index_name))
+            replica_map.replicas.setdefault(name, set()).add(replica_id)
+        return replica_map
+
+    @staticmethod
+    def base_name(name: str) -> str:
+        return REPLICA_SUFFIX.sub("", name)
+
+    def add(self, record: ClusterConfigIndexes):
+        key = (record.bucket, record.scope, record.collection, self.base_name(record.indexName))
+        replica_ids = self.replicas.get(key)
+        if replica_ids is None:
+            replica_ids = self.replicas[key] = set()
+        replica_ids.add(record.replicaId)
+        return self
+
+    def count(self, bucket: str, scope: str, collection: str, name: str) -> int:
+        return len(self.replicas.get((bucket, scope, collection, self.base_name(name)), ()))
+
+    @property
+    def as_dict(self):
+        return self.__dict__
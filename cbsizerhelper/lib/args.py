@@ -1,7 +1,13 @@
 ##
 ##
 
+import sys
 import argparse
+from cbsizerhelper.lib.cache import DEFAULT_CACHE_DIR
+from cbsizerhelper.lib.convert import LOAD_THREADS
+from cbsizerhelper.lib.server import DEFAULT_HOST, DEFAULT_PORT
+from cbsizerhelper.lib.watch import DEFAULT_INTERVAL, DEFAULT_DEBOUNCE
+from cbsizerhelper.lib.codec import get_codec
 
 
 def cloud_arg(value):
@@ -11,11 +17,32 @@ def cloud_arg(value):
         raise argparse.ArgumentTypeError("cloud should be aws, gcp, azure, or vm")
 
 
+def json_arg(value):
+    try:
+        get_codec(value)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err))
+    return value
+
+
 class Parameters(object):
 
-    def __init__(self):
+    def __init__(self, argv: list[str] = None):
+        argv = sys.argv[1:] if argv is None else argv
+        if len(argv) > 0 and argv[0] == "serve":
+            self.parameters = self.serve_parser().parse_args(argv[1:])
+            self.parameters.command = "serve"
+            return
+        if len(argv) > 0 and argv[0] == "fleet":
+            self.parameters = self.fleet_parser().parse_args(argv[1:])
+            self.parameters.command = "fleet"
+            return
+        if len(argv) > 0 and argv[0] == "export-columnar":
+            self.parameters = self.export_parser().parse_args(argv[1:])
+            self.parameters.command = "export"
+            return
         parent_parser = argparse.ArgumentParser(add_help=False)
-        parent_parser.add_argument('-i', '--input', action='append', help="Sizing output", required=True)
+        parent_parser.add_argument('-i', '--input', action='append', help="Sizing output file, directory or glob pattern", required=True)
         parent_parser.add_argument('-o', '--output', action='store', help="Output file", default="cluster_config.json")
         parent_parser.add_argument('-n', '--name', action='store', help="Name", default="Cluster")
         parent_parser.add_argument('-c', '--cloud', action='store', help="Cloud", default="aws", type=cloud_arg)
@@ -29,8 +56,65 @@ class Parameters(object):
         parent_parser.add_argument('--read', action='store', help="Read rate")
         parent_parser.add_argument('--write', action='store', help="Write rate")
         parent_parser.add_argument('--delete', action='store', help="Delete rate")
+        parent_parser.add_argument('--json', action='store', help="JSON backend (auto, orjson, msgspec, stdlib)", type=json_arg, default="auto")
+        parent_parser.add_argument('--compact', action='store_true', help="Write minified JSON output")
+        parent_parser.add_argument('--stream', action='store_true', help="Stream input files record by record")
+        parent_parser.add_argument('--validate', action='store', help="Input validation", choices=["full", "sample", "off"], default="full")
+        parent_parser.add_argument('--summary', action='store_true', help="Report periodic progress counts instead of a line per keyspace and index")
+        parent_parser.add_argument('--profile', action='store_true', help="Write per-phase timing report to <output>.profile.json (peak_memory covers only calls that did not overlap another phase, counted in concurrent_calls)")
+        parent_parser.add_argument('--cache', action='store', help="Parsed input cache directory", nargs='?', const=DEFAULT_CACHE_DIR)
+        parent_parser.add_argument('--cache-size', action='store', help="Parsed input cache size (MiB)", type=int, default=1024)
+        parent_parser.add_argument('--sweep', action='store', help="Scenario grid file for a parameter sweep")
+        parent_parser.add_argument('--sweep-mode', action='store', help="Write sweep scenarios to one file or one file each", choices=["combined", "split"], default="combined")
+        parent_parser.add_argument('--watch', action='store_true', help="Watch inputs and rewrite the output when they change")
+        parent_parser.add_argument('--interval', action='store', help="Watch poll interval (seconds)", type=float, default=DEFAULT_INTERVAL)
+        parent_parser.add_argument('--debounce', action='store', help="Seconds an input must be unchanged before it is read", type=float, default=DEFAULT_DEBOUNCE)
+        parent_parser.add_argument('-j', '--jobs', action='store', help="Parallel input file jobs", type=int, default=1)
+        parent_parser.add_argument('--threads', action='store', help="Concurrent input file readers", type=int, default=LOAD_THREADS)
         parent_parser.add_argument('-h', '--help', action='help', default=argparse.SUPPRESS, help='Show help message')
-        self.parameters = parent_parser.parse_args()
+        self.parameters = parent_parser.parse_args(argv)
+        self.parameters.command = "convert"
+
+    @staticmethod
+    def serve_parser() -> argparse.ArgumentParser:
+        serve_parser = argparse.ArgumentParser(prog="create_import serve", add_help=False)
+        serve_parser.add_argument('--host', action='store', help="Listen address", default=DEFAULT_HOST)
+        serve_parser.add_argument('--port', action='store', help="Listen port", type=int, default=DEFAULT_PORT)
+        serve_parser.add_argument('-w', '--workers', action='store', help="Conversion worker processes", type=int, default=2)
+        serve_parser.add_argument('--queue', action='store', help="Requests allowed to wait for a worker", type=int, default=8)
+        serve_parser.add_argument('--max-size', action='store', help="Maximum request size (MiB)", type=int, default=256)
+        serve_parser.add_argument('--json', action='store', help="JSON backend (auto, orjson, msgspec, stdlib)", type=json_arg, default="auto")
+        serve_parser.add_argument('-d', '--debug', action='store_true', help="Debug output")
+        serve_parser.add_argument('-v', '--verbose', action='store_true', help="Verbose output")
+        serve_parser.add_argument('-h', '--help', action='help', default=argparse.SUPPRESS, help='Show help message')
+        return serve_parser
+
+    @staticmethod
+    def fleet_parser() -> argparse.ArgumentParser:
+        fleet_parser = argparse.ArgumentParser(prog="create_import fleet", add_help=False)
+        fleet_parser.add_argument('manifest', action='store', help="Fleet manifest file")
+        fleet_parser.add_argument('-j', '--jobs', action='store', help="Parallel conversion jobs", type=int, default=1)
+        fleet_parser.add_argument('--journal', action='store', help="Checkpoint journal (default: <manifest>.journal)")
+        fleet_parser.add_argument('--no-retry', action='store_true', help="Do not retry jobs the journal records as failed")
+        fleet_parser.add_argument('--json', action='store', help="JSON backend (auto, orjson, msgspec, stdlib)", type=json_arg, default="auto")
+        fleet_parser.add_argument('-d', '--debug', action='store_true', help="Debug output")
+        fleet_parser.add_argument('-v', '--verbose', action='store_true', help="Verbose output")
+        fleet_parser.add_argument('-h', '--help', action='help', default=argparse.SUPPRESS, help='Show help message')
+        return fleet_parser
+
+    @staticmethod
+    def export_parser() -> argparse.ArgumentParser:
+        export_parser = argparse.ArgumentParser(prog="create_import export-columnar", add_help=False)
+        export_parser.add_argument('-i', '--input', action='append', help="Sizing output file, directory or glob pattern", required=True)
+        export_parser.add_argument('-o', '--output', action='store', help="Output .cbcol file for a single input, otherwise a directory (default: next to each input)")
+        export_parser.add_argument('--stream', action='store_true', help="Stream input files record by record")
+        export_parser.add_argument('--validate', action='store', help="Input validation", choices=["full", "sample", "off"], default="full")
+        export_parser.add_argument('--threads', action='store', help="Concurrent input file readers", type=int, default=LOAD_THREADS)
+        export_parser.add_argument('--json', action='store', help="JSON backend (auto, orjson, msgspec, stdlib)", type=json_arg, default="auto")
+        export_parser.add_argument('-d', '--debug', action='store_true', help="Debug output")
+        export_parser.add_argument('-v', '--verbose', action='store_true', help="Verbose output")
+        export_parser.add_argument('-h', '--help', action='help', default=argparse.SUPPRESS, help='Show help message')
+        return export_parser
 
     @property
     def args(self):
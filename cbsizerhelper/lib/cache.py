@@ -0,0 +1,176 @@
+##
+##
+
+import os
+import stat
+import pickle
+import hmac
+import hashlib
+import secrets
+import logging
+import tempfile
+import attr
+from pathlib import Path
+from typing import Optional
+from cbsizerhelper import __version__
+from cbsizerhelper.lib.sizing import ClusterConfig, SECTION_CLASSES
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAGIC = b"CBSZ2"
+CACHE_SUFFIX = ".cache"
+CACHE_KEY_FILE = "cache.key"
+CACHE_KEY_SIZE = 32
+CACHE_DIR_MODE = 0o700
+CACHE_KEY_MODE = 0o600
+CACHE_SECTIONS = ("data", "collections", "indexes")
+DEFAULT_CACHE_DIR = os.path.join(Path.home(), ".cache", "cbsizerhelper")
+DEFAULT_CACHE_SIZE = 1024 * 1024 * 1024
+HASH_CHUNK = 1024 * 1024
+
+
+def schema_digest() -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for name, record_class in SECTION_CLASSES.items():
+        digest.update(name.encode())
+        for field in attr.fields(record_class):
+            digest.update(field.name.encode())
+    return digest.hexdigest()
+
+
+PARSER_VERSION = f"{__version__}-{schema_digest()}"
+
+
+class ParseCache(object):
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, mode=CACHE_DIR_MODE, exist_ok=True)
+        self.check_private(self.cache_dir, stat.S_IWGRP | stat.S_IWOTH)
+        self.secret = self.read_secret()
+
+    @classmethod
+    def open(cls, cache_dir: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_CACHE_SIZE):
+        try:
+            return cls(cache_dir, max_size)
+        except (OSError, ValueError) as err:
+            logger.warning("Parse cache disabled: %s", err)
+            return None
+
+    @staticmethod
+    def check_private(path: str, denied: int, st: Optional[os.stat_result] = None):
+        st = st if st else os.stat(path)
+        if hasattr(os, "getuid") and st.st_uid != os.getuid():
+            raise ValueError(f"{path} is not owned by the current user")
+        if st.st_mode & denied:
+            raise ValueError(f"{path} is accessible by other users (mode {stat.S_IMODE(st.st_mode):o})")
+
+    def read_secret(self) -> bytes:
+        key_file = os.path.join(self.cache_dir, CACHE_KEY_FILE)
+        try:
+            fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, CACHE_KEY_MODE)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, 'wb') as secret_file:
+                secret_file.write(secrets.token_bytes(CACHE_KEY_SIZE))
+        with open(key_file, 'rb') as secret_file:
+            self.check_private(key_file, stat.S_IRWXG | stat.S_IRWXO, os.fstat(secret_file.fileno()))
+            secret = secret_file.read()
+        if len(secret) != CACHE_KEY_SIZE:
+            raise ValueError(f"{key_file} is not a valid cache key")
+        return secret
+
+    def checksum(self, payload: bytes) -> bytes:
+        return hashlib.blake2b(payload, digest_size=32, key=self.secret).digest()
+
+    @staticmethod
+    def file_hash(file_name: str) -> str:
+        digest = hashlib.blake2b(digest_size=32)
+        with open(file_name, 'rb') as input_file:
+            while True:
+                chunk = input_file.read(HASH_CHUNK)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(content_hash: str, variant: str = "") -> str:
+        return hashlib.blake2b(f"{PARSER_VERSION}:{variant}:{content_hash}".encode(), digest_size=32).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{CACHE_SUFFIX}")
+
+    def get(self, key: str) -> Optional[ClusterConfig]:
+        entry = self.path(key)
+        try:
+            with open(entry, 'rb') as cache_file:
+                blob = cache_file.read()
+        except OSError:
+            return None
+        try:
+            header_size = len(CACHE_MAGIC) + 32
+            if blob[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+                raise ValueError("bad magic")
+            checksum = blob[len(CACHE_MAGIC):header_size]
+            payload = blob[header_size:]
+            if not hmac.compare_digest(self.checksum(payload), checksum):
+                raise ValueError("checksum mismatch")
+            version, validate, records = pickle.loads(payload)
+            if version != PARSER_VERSION:
+                raise ValueError(f"parser version {version}")
+        except Exception as err:
+            logger.debug("Discarding cache entry %s: %s", entry, err)
+            self.remove(entry)
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return ClusterConfig({}, validate, records)
+
+    def put(self, key: str, config: ClusterConfig):
+        records = {name: config.section(name) for name in CACHE_SECTIONS}
+        payload = pickle.dumps((PARSER_VERSION, config.validate, records), protocol=pickle.HIGHEST_PROTOCOL)
+        blob = CACHE_MAGIC + self.checksum(payload) + payload
+        fd, temp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as cache_file:
+                cache_file.write(blob)
+            os.replace(temp_name, self.path(key))
+        except OSError as err:
+            logger.debug("Can not write cache entry %s: %s", key, err)
+            self.remove(temp_name)
+            return
+        self.evict()
+
+    def entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        with os.scandir(self.cache_dir) as scan:
+            for entry in scan:
+                if not entry.name.endswith(CACHE_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(e[1] for e in entries)
+        for mtime, size, entry in entries:
+            if total <= self.max_size:
+                break
+            self.remove(entry)
+            total -= size
+
+    @staticmethod
+    def remove(entry: str):
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
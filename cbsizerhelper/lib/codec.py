@@ -0,0 +1,160 @@
+##
+##
+
+import re
+import json
+import math
+from typing import Union, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+INDENT = 2
+COMPACT_SEPARATORS = (",", ":")
+NON_ASCII = re.compile(r'[^\x00-\x7e]')
+
+
+def escape_char(match) -> str:
+    code = ord(match.group(0))
+    if code > 0xffff:
+        code -= 0x10000
+        return f"\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}"
+    return f"\\u{code:04x}"
+
+
+def finite(data):
+    if isinstance(data, float):
+        return data if math.isfinite(data) else None
+    if isinstance(data, dict):
+        return {k: finite(v) for k, v in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [finite(v) for v in data]
+    return data
+
+
+def ensure_ascii(text: str) -> str:
+    if text.isascii() and "\x7f" not in text:
+        return text
+    return NON_ASCII.sub(escape_char, text)
+
+
+class JSONCodec(object):
+    name = "stdlib"
+
+    @staticmethod
+    def available() -> bool:
+        return True
+
+    def loads(self, data: Union[str, bytes]):
+        return json.loads(data)
+
+    def dumps(self, data, compact: bool = False) -> str:
+        try:
+            return self.encode(data, compact)
+        except ValueError:
+            return self.encode(finite(data), compact)
+
+    @staticmethod
+    def encode(data, compact: bool = False) -> str:
+        if compact:
+            return json.dumps(data, separators=COMPACT_SEPARATORS, allow_nan=False)
+        return json.dumps(data, indent=INDENT, allow_nan=False)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    @staticmethod
+    def available() -> bool:
+        return orjson is not None
+
+    def loads(self, data: Union[str, bytes]):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+    def dumps(self, data, compact: bool = False) -> str:
+        try:
+            encoded = orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            return super().dumps(data, compact)
+        return ensure_ascii(encoded.decode('utf-8'))
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        self.encoder = msgspec.json.Encoder() if msgspec else None
+        self.decoder = msgspec.json.Decoder() if msgspec else None
+
+    @staticmethod
+    def available() -> bool:
+        return msgspec is not None
+
+    def loads(self, data: Union[str, bytes]):
+        try:
+            return self.decoder.decode(data)
+        except (msgspec.DecodeError, ValueError):
+            return super().loads(data)
+
+    def dumps(self, data, compact: bool = False) -> str:
+        try:
+            encoded = self.encoder.encode(data)
+        except (msgspec.EncodeError, TypeError, OverflowError):
+            return super().dumps(data, compact)
+        if not compact:
+            encoded = msgspec.json.format(encoded, indent=INDENT)
+        return ensure_ascii(encoded.decode('utf-8'))
+
+
+CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "stdlib": JSONCodec,
+}
+BACKENDS = ("auto",) + tuple(CODECS)
+
+_default: Optional[JSONCodec] = None
+
+
+def get_codec(name: str = "auto") -> JSONCodec:
+    if name == "auto":
+        for codec_class in CODECS.values():
+            if codec_class.available():
+                return codec_class()
+    codec_class = CODECS.get(name)
+    if codec_class is None:
+        raise ValueError(f"unknown JSON backend {name}")
+    if not codec_class.available():
+        raise ValueError(f"JSON backend {name} requires the {name} package (pip install cbsizerhelper[{name}])")
+    return codec_class()
+
+
+def default_codec() -> JSONCodec:
+    global _default
+    if _default is None:
+        _default = get_codec()
+    return _default
+
+
+def set_default_codec(name: str) -> JSONCodec:
+    global _default
+    _default = get_codec(name)
+    return _default
+
+
+def loads(data: Union[str, bytes]):
+    return default_codec().loads(data)
+
+
+def dumps(data, compact: bool = False) -> str:
+    return default_codec().dumps(data, compact)
@@ -0,0 +1,312 @@
+##
+##
+
+import os
+import sys
+import json
+import mmap
+import struct
+import attr
+from array import array
+from typing import Optional, Iterable, Callable, Any, BinaryIO
+from cbsizerhelper.lib.exceptions import DataError
+from cbsizerhelper.lib.schema import ValidateMode
+from cbsizerhelper.lib.sizing import ClusterConfig, SECTION_CLASSES, SECTION_SCHEMAS, SECTION_BUILDERS
+
+COLUMNAR_MAGIC = b"CBSZCOL1"
+COLUMNAR_VERSION = 1
+COLUMNAR_SUFFIX = ".cbcol"
+COLUMNAR_SECTIONS = ("data", "collections", "indexes")
+HEADER_SIZE = struct.Struct("<Q")
+ALIGN = 8
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+KIND_FORMATS = {
+    "i64": "q",
+    "f64": "d",
+    "bool": "?",
+}
+STORE_FORMATS = {
+    "i64": "q",
+    "f64": "d",
+    "bool": "B",
+}
+KIND_TYPES = {
+    "i64": int,
+    "f64": float,
+    "bool": bool,
+    "str": str,
+}
+CODE_FORMAT = "I"
+OFFSET_FORMAT = "Q"
+
+
+def columnar_name(file_name: str) -> str:
+    base = os.path.basename(file_name)
+    for suffix in (".gz", ".xz", ".zst"):
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+    return os.path.join(os.path.dirname(file_name), f"{os.path.splitext(base)[0]}{COLUMNAR_SUFFIX}")
+
+
+def column_kind(values: list) -> str:
+    present = [v for v in values if v is not None]
+    if not present:
+        return "null"
+    types = set(type(v) for v in present)
+    if types == {bool}:
+        return "bool"
+    if types == {str}:
+        return "str"
+    if types == {int} and INT64_MIN <= min(present) and max(present) <= INT64_MAX:
+        return "i64"
+    if types == {float}:
+        return "f64"
+    return "json"
+
+
+class ColumnarWriter(object):
+
+    def __init__(self, output_file: BinaryIO):
+        self.output_file = output_file
+        self.buffers = []
+        self.size = 0
+
+    def buffer(self, data: bytes) -> list[int]:
+        offset = self.size
+        self.buffers.append(data)
+        self.size += len(data)
+        padding = -self.size % ALIGN
+        if padding:
+            self.buffers.append(b"\x00" * padding)
+            self.size += padding
+        return [offset, len(data)]
+
+    def column(self, name: str, values: list) -> dict:
+        kind = column_kind(values)
+        entry = {"name": name, "type": kind, "buffers": {}}
+        if kind == "null":
+            return entry
+        if None in values:
+            entry["buffers"]["validity"] = self.buffer(array("B", [v is not None for v in values]).tobytes())
+        if kind == "str":
+            strings = {}
+            codes = [None if v is None else strings.setdefault(v, len(strings)) for v in values]
+            codes = array(CODE_FORMAT, [len(strings) if c is None else c for c in codes])
+            encoded = [s.encode('utf-8') for s in strings]
+            offsets = array(OFFSET_FORMAT, [0])
+            for item in encoded:
+                offsets.append(offsets[-1] + len(item))
+            entry["buffers"]["values"] = self.buffer(codes.tobytes())
+            entry["buffers"]["offsets"] = self.buffer(offsets.tobytes())
+            entry["buffers"]["strings"] = self.buffer(b"".join(encoded))
+            entry["strings"] = len(strings)
+        elif kind == "json":
+            entry["buffers"]["values"] = self.buffer(json.dumps(values).encode('utf-8'))
+        else:
+            default = False if kind == "bool" else 0
+            entry["buffers"]["values"] = self.buffer(array(STORE_FORMATS[kind], [default if v is None else v for v in values]).tobytes())
+        return entry
+
+    def section(self, name: str, records: list) -> dict:
+        fields = attr.fields(SECTION_CLASSES[name])
+        return {
+            "rows": len(records),
+            "columns": [self.column(f.name, [getattr(r, f.name) for r in records]) for f in fields],
+        }
+
+    def write(self, config: ClusterConfig) -> int:
+        sections = {name: self.section(name, config.section(name)) for name in COLUMNAR_SECTIONS}
+        header = json.dumps({
+            "version": COLUMNAR_VERSION,
+            "byteorder": sys.byteorder,
+            "validate": config.validate.value,
+            "sections": sections,
+        }).encode('utf-8')
+        prefix = COLUMNAR_MAGIC + HEADER_SIZE.pack(len(header)) + header
+        prefix += b"\x00" * (-len(prefix) % ALIGN)
+        self.output_file.write(prefix)
+        for data in self.buffers:
+            self.output_file.write(data)
+        return len(prefix) + self.size
+
+
+class Column(object):
+
+    def __init__(self, name: str, kind: str, rows: int, buffers: dict[str, memoryview], strings: int = 0, swap: bool = False):
+        self.name = name
+        self.kind = kind
+        self.rows = rows
+        self.buffers = buffers
+        self.swap = swap
+        self.string_count = strings
+        self.string_table = None
+
+    def detach(self):
+        buffers = self.buffers
+        self.buffers = {key: memoryview(bytes(view)) for key, view in buffers.items()}
+        for view in buffers.values():
+            view.release()
+
+    def typed(self, buffer: str, fmt: str):
+        view = self.buffers[buffer]
+        if self.swap and struct.calcsize(fmt) > 1:
+            values = array(fmt, view)
+            values.byteswap()
+            return values
+        return view.cast(fmt)
+
+    @property
+    def validity(self) -> Optional[list]:
+        if "validity" not in self.buffers:
+            return None
+        return self.buffers["validity"].tolist()
+
+    @property
+    def nullable(self) -> bool:
+        return self.kind == "null" or "validity" in self.buffers
+
+    @property
+    def strings(self) -> list[Optional[str]]:
+        if self.string_table is None:
+            offsets = self.typed("offsets", OFFSET_FORMAT)
+            blob = bytes(self.buffers["strings"])
+            self.string_table = [blob[offsets[n]:offsets[n + 1]].decode('utf-8') for n in range(self.string_count)] + [None]
+        return self.string_table
+
+    def keys(self):
+        if self.kind == "str":
+            return self.typed("values", CODE_FORMAT)
+        return self.to_list()
+
+    def value(self, key):
+        if self.kind == "str":
+            return self.strings[key]
+        return key
+
+    def to_list(self) -> list:
+        if self.kind == "null":
+            return [None] * self.rows
+        if self.kind == "json":
+            return json.loads(bytes(self.buffers["values"]))
+        if self.kind == "str":
+            return list(map(self.strings.__getitem__, self.typed("values", CODE_FORMAT)))
+        values = self.typed("values", KIND_FORMATS[self.kind]).tolist()
+        validity = self.validity
+        if validity is None:
+            return values
+        return [v if ok else None for v, ok in zip(values, validity)]
+
+    def types(self) -> set[type]:
+        if self.kind in KIND_TYPES:
+            return {KIND_TYPES[self.kind]}
+        if self.kind == "json":
+            return set(type(v) for v in self.to_list() if v is not None)
+        return set()
+
+
+class ColumnTable(object):
+
+    def __init__(self, name: str, rows: int, columns: dict[str, Column]):
+        self.name = name
+        self.rows = rows
+        self.columns = columns
+
+    def column(self, name: str) -> Column:
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = Column(name, "null", self.rows, {})
+        return column
+
+    def detach(self):
+        for column in self.columns.values():
+            column.detach()
+
+    def validate(self, mode: ValidateMode = ValidateMode.FULL):
+        if mode == ValidateMode.OFF or self.rows == 0:
+            return
+        for name, types, optional in SECTION_SCHEMAS[self.name].columns:
+            column = self.column(name)
+            if column.nullable and not optional:
+                raise DataError(f"{self.name} column {name} has missing values")
+            for value_type in column.types():
+                if not issubclass(value_type, types):
+                    raise DataError(f"{self.name} column {name} must be {types} (got {value_type})")
+
+    def select(self, name: str, predicate: Callable[[Any], bool]) -> list[int]:
+        return [n for n, value in enumerate(self.column(name).to_list()) if predicate(value)]
+
+    def records(self, rows: Optional[Iterable[int]] = None) -> list:
+        fields = attr.fields(SECTION_CLASSES[self.name])
+        values = [self.column(f.name).to_list() for f in fields]
+        if rows is not None:
+            rows = list(rows)
+            values = [list(map(column.__getitem__, rows)) for column in values]
+        return list(map(SECTION_BUILDERS[self.name], zip(*values)))
+
+
+class ColumnarFile(object):
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.tables = {}
+        with open(file_name, 'rb') as input_file:
+            self.map = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        try:
+            self.parse()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def parse(self):
+        view = self.view
+        if bytes(view[:len(COLUMNAR_MAGIC)]) != COLUMNAR_MAGIC:
+            raise ValueError("not a columnar capture")
+        start = len(COLUMNAR_MAGIC) + HEADER_SIZE.size
+        header_size, = HEADER_SIZE.unpack_from(view, len(COLUMNAR_MAGIC))
+        self.header = json.loads(bytes(view[start:start + header_size]))
+        if self.header.get("version") != COLUMNAR_VERSION:
+            raise ValueError(f"unsupported columnar version {self.header.get('version')}")
+        data_offset = start + header_size + (-(start + header_size) % ALIGN)
+        swap = self.header.get("byteorder", sys.byteorder) != sys.byteorder
+        for name, section in self.header["sections"].items():
+            if name not in SECTION_CLASSES:
+                continue
+            table = self.tables[name] = ColumnTable(name, section["rows"], {})
+            for entry in section["columns"]:
+                if any(data_offset + offset + length > len(view) for offset, length in entry["buffers"].values()):
+                    raise ValueError(f"{name} column {entry['name']} is truncated")
+                buffers = {key: view[data_offset + offset:data_offset + offset + length] for key, (offset, length) in entry["buffers"].items()}
+                table.columns[entry["name"]] = Column(entry["name"], entry["type"], section["rows"], buffers, entry.get("strings", 0), swap)
+
+    def close(self):
+        if self.map is None:
+            return
+        for table in self.tables.values():
+            table.detach()
+        self.view.release()
+        self.map.close()
+        self.view = None
+        self.map = None
+
+    @staticmethod
+    def detect(file_name: str) -> bool:
+        with open(file_name, 'rb') as input_file:
+            return input_file.read(len(COLUMNAR_MAGIC)) == COLUMNAR_MAGIC
+
+    @staticmethod
+    def write(config: ClusterConfig, output_file: BinaryIO) -> int:
+        return ColumnarWriter(output_file).write(config)
+
+    def config(self, validate: ValidateMode = ValidateMode.FULL) -> ClusterConfig:
+        for table in self.tables.values():
+            table.validate(validate)
+        return ClusterConfig({}, validate, {}, dict(self.tables))
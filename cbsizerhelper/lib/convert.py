@@ -0,0 +1,494 @@
+##
+##
+
+import os
+import copy
+import logging
+import attr
+from attr.validators import instance_of as io
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Union, Optional, Iterator
+from cbsizerhelper.lib.exceptions import InputFileReadError, InputFileProcessError, OutputFileWriteError, DataError
+from cbsizerhelper.lib.aggregate import KeyspaceAggregate, IndexReplicaMap
+from cbsizerhelper.lib.naming import UniqueNames
+from cbsizerhelper.lib.stream import JSONStreamReader
+from cbsizerhelper.lib.schema import ValidateMode
+from cbsizerhelper.lib.profile import PhaseProfiler
+from cbsizerhelper.lib.logging import ProgressReporter
+from cbsizerhelper.lib.cache import ParseCache, DEFAULT_CACHE_SIZE
+from cbsizerhelper.lib.sweep import ScenarioSweep
+from cbsizerhelper.lib.source import SourceFile
+from cbsizerhelper.lib.inputs import InputSet, SkippedInput, output_files
+from cbsizerhelper.lib.merge import ConfigMerge
+from cbsizerhelper.lib import codec
+from cbsizerhelper.lib.output import AtomicFile
+from cbsizerhelper.lib.columnar import ColumnarFile, columnar_name, COLUMNAR_SUFFIX
+from cbsizerhelper.lib.sizing import (ClusterConfig, SizingConfig, SizingCluster, SizingClusterData, SizingClusterBuckets, SizingClusterBucket, SizingClusterScope,
+                                      SizingClusterCollection, SizingClusterIndex, SizingClusterIndexEntry, SizingClusterPlasmaIndexes, SizingClusterQuery, SizingServiceGroup,
+                                      SearchService, EventingService, AnalyticsService, AppServices)
+
+logger = logging.getLogger(__name__)
+
+LOAD_THREADS = 4
+
+
+def bucket_totals(record: dict) -> bool:
+    return record.get("ep_couch_bucket", "").endswith(" totals:")
+
+
+STREAM_SECTIONS = {
+    "data": bucket_totals,
+    "collections": None,
+    "indexes": None,
+}
+STREAM_NODE_SECTIONS = dict(STREAM_SECTIONS, data=None)
+
+
+@attr.s
+class ConvertOptions(object):
+    name = attr.ib(validator=io(str), default="Cluster")
+    cloud = attr.ib(validator=io(str), default="aws")
+    self_managed = attr.ib(validator=io(bool), default=False)
+    combine = attr.ib(validator=io(bool), default=False)
+    skip = attr.ib(validator=io(bool), default=False)
+    bucket_ratio = attr.ib(default=None)
+    index_ratio = attr.ib(default=None)
+    read = attr.ib(default=None)
+    write = attr.ib(default=None)
+    delete = attr.ib(default=None)
+    stream = attr.ib(validator=io(bool), default=False)
+    jobs = attr.ib(validator=io(int), default=1)
+    validate = attr.ib(validator=io(ValidateMode), default=ValidateMode.FULL, converter=ValidateMode)
+    cache_dir = attr.ib(validator=attr.validators.optional(io(str)), default=None)
+    cache_size = attr.ib(validator=io(int), default=DEFAULT_CACHE_SIZE)
+    threads = attr.ib(validator=io(int), default=LOAD_THREADS)
+    summary = attr.ib(validator=io(bool), default=False)
+    output = attr.ib(validator=attr.validators.optional(io(str)), default=None)
+
+    @classmethod
+    def from_args(cls, parameters):
+        return cls(
+            parameters.name,
+            parameters.cloud,
+            parameters.self,
+            parameters.combine,
+            parameters.skip,
+            parameters.bucket_ratio,
+            parameters.index_ratio,
+            parameters.read,
+            parameters.write,
+            parameters.delete,
+            parameters.stream,
+            parameters.jobs,
+            parameters.validate,
+            parameters.cache,
+            parameters.cache_size * 1024 * 1024,
+            parameters.threads,
+            parameters.summary,
+            parameters.output,
+        )
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+class SizingConverter(object):
+
+    def __init__(self, options: Optional[ConvertOptions] = None, profiler: Optional[PhaseProfiler] = None):
+        self.options = options if options else ConvertOptions()
+        self.profiler = profiler if profiler else PhaseProfiler.disabled()
+        self.name = self.options.name
+        self.skip = self.options.skip
+        self.cloud = self.options.cloud
+        self.self_managed = self.options.self_managed
+        self.bucket_ratio = self.options.bucket_ratio
+        self.index_ratio = int(self.options.index_ratio) if self.options.index_ratio else 10
+        self.read_rate = self.options.read
+        self.write_rate = self.options.write
+        self.delete_rate = self.options.delete
+        self.stream = self.options.stream
+        self.stream_sections = STREAM_NODE_SECTIONS if self.options.combine else STREAM_SECTIONS
+        self.jobs = self.options.jobs
+        self.threads = max(1, self.options.threads)
+        self.progress = ProgressReporter(logger, self.options.summary)
+        self.validate = self.options.validate
+        self.cache = ParseCache.open(self.options.cache_dir, self.options.cache_size) if self.options.cache_dir else None
+        self.skipped = []
+
+    def convert(self, sources: list[Union[str, dict]]) -> dict:
+        sizer_config = SizingConfig.build()
+        for cluster in self.clusters(sources):
+            sizer_config.cluster(cluster)
+        return sizer_config.as_dict
+
+    def clusters(self, sources: list[Union[str, dict]]) -> Iterator[dict]:
+        sources = self.expand(sources)
+
+        if self.options.combine:
+            yield self.process(1, [self.merge(sources)])
+        elif self.jobs > 1 and len(sources) > 1:
+            yield from self.process_parallel(sources)
+        else:
+            for count, (index, config) in enumerate(self.load_all(sources)):
+                yield self.process(count + 1, [config])
+
+        self.progress.report()
+        self.report_skipped()
+
+    def expand(self, sources: list[Union[str, dict]]) -> list[Union[str, dict]]:
+        inputs = InputSet.expand(sources, output_files(self.options.output))
+        self.skipped = []
+        for skipped in inputs.skipped:
+            self.skip_input(skipped.path, skipped.reason)
+        if not inputs.sources:
+            raise InputFileReadError(f"no readable sizing files in {', '.join(s for s in sources if isinstance(s, str))}")
+        if inputs.skipped:
+            logger.info("Found %d input(s), skipped %d", len(inputs.sources), len(inputs.skipped))
+        return inputs.sources
+
+    def skip_input(self, path: str, reason: str):
+        logger.warning("Skipping input %s: %s", path, reason)
+        self.skipped.append(SkippedInput(path, reason))
+
+    def report_skipped(self):
+        if self.skipped:
+            logger.warning("Skipped %d input(s): %s", len(self.skipped), "; ".join(f"{s.path} ({s.reason})" for s in self.skipped))
+
+    def merge(self, sources: list[Union[str, dict]]) -> ClusterConfig:
+        merge = ConfigMerge.build()
+        for index, config in self.load_all(sources):
+            with self.profiler.phase("merge") as phase:
+                merge.add(config, self.source_name(sources[index], index))
+                phase.count(inputs=1)
+        with self.profiler.phase("merge") as phase:
+            config = merge.config(self.validate)
+            phase.count(buckets=len(merge.buckets), collections=len(merge.collections), indexes=len(merge.indexes))
+        logger.info("Merged %d input(s) into %d bucket(s)", merge.count, len(merge.buckets))
+        return config
+
+    def load_all(self, sources: list[Union[str, dict]]) -> Iterator[tuple[int, ClusterConfig]]:
+        errors = []
+        if self.threads == 1 or len(sources) == 1:
+            results = map(self.load_source, sources)
+        else:
+            results = self.load_pool(sources)
+        for count, (config, error) in enumerate(results):
+            if error:
+                self.skip_input(self.source_name(sources[count], count), error)
+                errors.append(error)
+                continue
+            yield count, config
+        self.check_loaded(sources, errors)
+
+    @staticmethod
+    def check_loaded(sources: list[Union[str, dict]], errors: list[str]):
+        if len(errors) == len(sources):
+            raise InputFileReadError(errors[0] if len(errors) == 1 else f"no readable sizing files ({len(errors)} failed to load, first: {errors[0]})")
+
+    def load_pool(self, sources: list[Union[str, dict]]) -> Iterator[tuple[Optional[ClusterConfig], Optional[str]]]:
+        with ThreadPoolExecutor(max_workers=min(self.threads, len(sources))) as executor:
+            pending = deque()
+            for source in sources:
+                pending.append(executor.submit(self.load_source, source))
+                if len(pending) >= self.threads * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def load_source(self, source: Union[str, dict]) -> tuple[Optional[ClusterConfig], Optional[str]]:
+        try:
+            return self.load(source), None
+        except (InputFileReadError, DataError) as err:
+            return None, str(err)
+
+    def export_columnar(self, sources: list[Union[str, dict]], output: Optional[str] = None) -> list[tuple[str, str, int]]:
+        sources = self.expand(sources)
+        to_dir = output is not None and (len(sources) > 1 or not output.endswith(COLUMNAR_SUFFIX))
+        exported = []
+        for count, config in self.load_all(sources):
+            source = self.source_name(sources[count], count)
+            target = columnar_name(sources[count] if isinstance(sources[count], str) else f"input{count + 1}.json")
+            if to_dir:
+                os.makedirs(output, exist_ok=True)
+                target = os.path.join(output, os.path.basename(target))
+            elif output is not None:
+                target = output
+            with self.profiler.phase("export") as phase:
+                try:
+                    with AtomicFile(target, 'wb') as output_file:
+                        size = ColumnarFile.write(config, output_file)
+                except OSError as err:
+                    raise OutputFileWriteError(f"can not write columnar file {target}: {err}")
+                phase.count(files=1, bytes=size)
+            logger.info("Exported %s to %s (%d bytes)", source, target, size)
+            exported.append((source, target, size))
+        self.report_skipped()
+        return exported
+
+    def sweep(self, sources: list[Union[str, dict]]) -> ScenarioSweep:
+        return ScenarioSweep(self.convert(sources)["clusters"])
+
+    def process_job(self, count: int, source: Union[str, dict]) -> tuple[Optional[dict], dict, Optional[str]]:
+        self.profiler.reset()
+        config, error = self.load_source(source)
+        if error:
+            return None, self.profiler.as_dict, error
+        try:
+            cluster = self.process(count, [config])
+        except Exception as err:
+            raise RuntimeError(str(err)) from None
+        return cluster, self.profiler.as_dict, None
+
+    def process_parallel(self, sources: list[Union[str, dict]]) -> Iterator[dict]:
+        executor = ProcessPoolExecutor(max_workers=min(self.jobs, len(sources)))
+        pending = deque()
+        submitted = 0
+        produced = 0
+        errors = []
+        try:
+            while submitted < len(sources) or pending:
+                while submitted < len(sources) and len(pending) < self.jobs * 2:
+                    pending.append((submitted, executor.submit(self.process_job, submitted + 1, sources[submitted])))
+                    submitted += 1
+                count, future = pending.popleft()
+                source = self.source_name(sources[count], count)
+                try:
+                    cluster, phases, error = future.result()
+                except Exception as err:
+                    raise InputFileProcessError(f"can not process sizing file {source}: {err}")
+                self.profiler.merge(phases)
+                if error:
+                    self.skip_input(source, error)
+                    errors.append(error)
+                    continue
+                produced += 1
+                cluster["name"] = f"{self.name}{produced}"
+                yield cluster
+            self.check_loaded(sources, errors)
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+    @staticmethod
+    def source_name(source: Union[str, dict], count: int) -> str:
+        return source if isinstance(source, str) else f"<input {count + 1}>"
+
+    @staticmethod
+    def read_file(file_name: str) -> dict:
+        return SizingConverter.decode_text(SizingConverter.read_text(file_name), file_name)
+
+    @staticmethod
+    def read_text(file_name: str) -> str:
+        try:
+            return SourceFile(file_name).read_text()
+        except Exception as err:
+            raise InputFileReadError(f"can not read sizing file {file_name}: {err}")
+
+    @staticmethod
+    def decode_text(text: str, file_name: str) -> dict:
+        try:
+            return codec.loads(text)
+        except Exception as err:
+            raise InputFileReadError(f"can not read sizing file {file_name}: {err}")
+
+    @staticmethod
+    def stream_file(file_name: str, validate: ValidateMode = ValidateMode.FULL, sections: dict = STREAM_SECTIONS) -> ClusterConfig:
+        try:
+            with SourceFile(file_name).open_text() as input_file:
+                return ClusterConfig.from_stream(JSONStreamReader(input_file).items(), sections, validate)
+        except Exception as err:
+            raise InputFileReadError(f"can not read sizing file {file_name}: {err}")
+
+    @staticmethod
+    def is_columnar(file_name: str) -> bool:
+        try:
+            return ColumnarFile.detect(file_name)
+        except OSError:
+            return False
+
+    @staticmethod
+    def read_columnar(file_name: str, validate: ValidateMode = ValidateMode.FULL) -> ClusterConfig:
+        try:
+            columnar_file = ColumnarFile(file_name)
+        except Exception as err:
+            raise InputFileReadError(f"can not read columnar file {file_name}: {err}")
+        with columnar_file:
+            return columnar_file.config(validate)
+
+    def cache_key(self, file_name: str) -> str:
+        try:
+            content_hash = self.cache.file_hash(file_name)
+        except Exception as err:
+            raise InputFileReadError(f"can not read sizing file {file_name}: {err}")
+        variant = f"{self.validate.value}:{self.stream}"
+        if self.stream and self.stream_sections is STREAM_NODE_SECTIONS:
+            variant += ":nodes"
+        return self.cache.key(content_hash, variant)
+
+    def load(self, source: Union[str, dict, ClusterConfig]) -> ClusterConfig:
+        if isinstance(source, ClusterConfig):
+            return source
+        if isinstance(source, str) and self.is_columnar(source):
+            with self.profiler.phase("read") as phase:
+                config = self.read_columnar(source, self.validate)
+                phase.count(files=1)
+            return config
+        data = None
+        config = None
+        key = None
+        if self.cache and isinstance(source, str):
+            with self.profiler.phase("cache") as phase:
+                key = self.cache_key(source)
+                config = self.cache.get(key)
+                phase.count(hits=1 if config else 0, misses=0 if config else 1)
+            if config:
+                logger.debug("Loaded %s from cache", source)
+                return config
+        if isinstance(source, dict):
+            data = source
+        elif self.stream:
+            with self.profiler.phase("read") as phase:
+                config = self.stream_file(source, self.validate, self.stream_sections)
+                phase.count(files=1)
+        else:
+            with self.profiler.phase("read") as phase:
+                text = self.read_text(source)
+                phase.count(files=1, bytes=len(text))
+            with self.profiler.phase("json_decode"):
+                data = self.decode_text(text, source)
+                del text
+        with self.profiler.phase("from_config") as phase:
+            if config is None:
+                config = ClusterConfig.from_config(data, self.validate)
+                del data
+            config.load("data", "collections", "indexes")
+            phase.count(data=len(config.data), collections=len(config.collections), indexes=len(config.indexes))
+        if key:
+            with self.profiler.phase("cache"):
+                self.cache.put(key, config)
+        return config
+
+    def process(self, count: int, sources: list[Union[str, dict]]) -> dict:
+        ops_sec = 0
+        config_list = []
+        epoch_time = datetime(1970, 1, 1).replace(tzinfo=timezone.utc)
+
+        for source in sources:
+            config_list.append(self.load(source))
+        cluster = SizingCluster.build(f"{self.name}{count}", self.cloud, self.self_managed)
+        data = SizingClusterData.build()
+        buckets = SizingClusterBuckets.build()
+        index = SizingClusterIndex.build()
+        indexes = SizingClusterPlasmaIndexes.build()
+        bucket_count = 0
+        index_count = 0
+
+        for config in config_list:
+            with self.profiler.phase("keyspace_aggregation") as phase:
+                collections_null = False
+                if config.count("collections") == 0:
+                    collections_null = True
+                table = config.columnar("collections")
+                keyspaces = KeyspaceAggregate.from_columns(table) if table is not None else KeyspaceAggregate.from_config(config.collections)
+                for item in config.data:
+                    if item.ep_couch_bucket.endswith(" totals:"):
+                        bucket_name = item.ep_couch_bucket.split(" totals:")[0]
+                        logger.debug("Processing bucket %s", bucket_name)
+                        bucket = SizingClusterBucket.build(str(bucket_count), bucket_name, item)
+                        ops_sec += int(item.avg_cmd_get + item.avg_cmd_set)
+                        if collections_null:
+                            keyspaces.add(config.default_collection(bucket_name, item.curr_items))
+                        scope_count = 0
+                        for scope_name in keyspaces.scopes(bucket_name):
+                            if scope_name == "_system":
+                                continue
+                            logger.debug("Processing scope %s", scope_name)
+                            scope = SizingClusterScope.build(str(scope_count), scope_name)
+                            collection_count = 0
+                            for collection, collection_total in keyspaces.collections(bucket_name, scope_name):
+                                self.progress.item("keyspaces", "Processing keyspace %s.%s.%s", bucket_name, scope_name, collection)
+                                collection = SizingClusterCollection.build(str(collection_count), collection, collection_total, item,
+                                                                           self.bucket_ratio, self.read_rate, self.write_rate, self.delete_rate)
+                                scope.collection(collection)
+                                collection_count += 1
+                                phase.count(collections=1)
+                            bucket.scope(scope)
+                            scope_count += 1
+                            phase.count(scopes=1)
+                        buckets.bucket(bucket)
+                        bucket_count += 1
+                        phase.count(buckets=1)
+
+            with self.profiler.phase("index_grouping") as phase:
+                if config.count("indexes") > 0:
+                    index_table = {}
+                    logger.debug("Found %d index record(s)", config.count("indexes"))
+                    table = config.columnar("indexes")
+                    replica_map = IndexReplicaMap.from_columns(table) if table is not None else IndexReplicaMap.from_config(config.indexes)
+                    for item in config.primary_indexes():
+                        last_scanned = datetime.strptime(item.last_known_scan_time, '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc)
+                        if (last_scanned.timestamp() - epoch_time.timestamp()) == 0:
+                            if self.skip:
+                                continue
+                        if item.scope == "_system":
+                            logger.debug("Skipping index scope %s", item.scope)
+                            continue
+                        keyspace = f"{item.bucket}.{item.scope}.{item.collection}"
+                        if not index_table.get(keyspace):
+                            index_table[keyspace] = {}
+                        if not index_table[keyspace].get(item.indexName):
+                            index_table[keyspace][item.indexName] = {}
+                            index_table[keyspace][item.indexName]['records'] = []
+                        index_table[keyspace][item.indexName]['records'].append(item)
+
+                    for _keyspace, _indexes in index_table.items():
+                        logger.debug("Index keyspace %s:", _keyspace)
+                        for _index_name, _index_data in index_table[_keyspace].items():
+                            _index_data['summary'] = _index_data['records'][0]
+                            if len(_index_data['records']) > 1:
+                                _items_count = sum(_item.items_count for _item in _index_data['records'])
+                                _index_data['summary'] = copy.copy(_index_data['summary'])
+                                _index_data['summary'].items_count = _items_count
+
+                            bucket = buckets.get_bucket(_index_data['summary'].bucket)
+                            scope = bucket.get_scope(_index_data['summary'].scope)
+                            collection = scope.get_collection(_index_data['summary'].collection)
+                            replicas = replica_map.count(_index_data['summary'].bucket, _index_data['summary'].scope, _index_data['summary'].collection, _index_name)
+
+                            index_entry = SizingClusterIndexEntry.from_config(str(index_count), bucket, scope, collection, replicas, _index_data['summary'], self.index_ratio)
+                            self.progress.item("indexes", "Adding index %d (%s) from keyspace %s", index_count + 1, _index_name, _keyspace)
+                            indexes.index(index_entry.as_dict)
+                            index_count += 1
+                            phase.count(indexes=1)
+
+                    logger.info("Processed %d indexes", len(indexes.indexes))
+                else:
+                    indexes.index(SizingClusterIndexEntry().as_dict)
+
+        with self.profiler.phase("service_assembly"):
+            UniqueNames.build().apply(buckets.buckets)
+
+            data.bucket(buckets.as_dict)
+            cluster.service(data.as_dict)
+            cluster.service_group(SizingServiceGroup.create(["data"], self.cloud).as_dict)
+
+            if len(indexes.indexes) > 0:
+                index.indexes(indexes.as_dict)
+                UniqueNames.build().apply(index.index["indexes"])
+                cluster.service(index.as_dict)
+                cluster.service(SizingClusterQuery.create(ops_sec).as_dict)
+
+            cluster.service(SearchService.default().as_dict)
+            cluster.service(EventingService.default().as_dict)
+            cluster.service(AnalyticsService.default().as_dict)
+            cluster.service(AppServices.default().as_dict)
+
+        return cluster.as_dict
+
+
+def convert(sources: list[Union[str, dict]], options: Optional[ConvertOptions] = None, profiler: Optional[PhaseProfiler] = None) -> dict:
+    return SizingConverter(options, profiler).convert(sources)
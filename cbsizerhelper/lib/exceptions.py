@@ -1,23 +1,15 @@
 ##
 ##
 
-import sys
 import os
 import inspect
-import logging
 
 
 class FatalError(Exception):
 
     def __init__(self, message):
-        import traceback
-        logging.debug(traceback.print_exc())
-        frame = inspect.currentframe().f_back
-        (filename, line, function, lines, index) = inspect.getframeinfo(frame)
-        filename = os.path.basename(filename)
-        logging.debug("Error: {} in {} {} at line {}: {}".format(type(self).__name__, filename, function, line, message))
-        logging.error(f"{message} [{filename}:{line}]")
-        sys.exit(1)
+        self.message = message
+        super().__init__(message)
 
 
 class NonFatalError(Exception):
@@ -35,6 +27,10 @@ class InputFileReadError(FatalError):
     pass
 
 
+class InputFileProcessError(FatalError):
+    pass
+
+
 class OutputFileWriteError(FatalError):
     pass
 
@@ -0,0 +1,244 @@
+##
+##
+
+import os
+import json
+import time
+import hashlib
+import logging
+import attr
+from attr.validators import instance_of as io
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Iterator
+from cbsizerhelper.lib.exceptions import InputFileReadError, DataError
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter
+from cbsizerhelper.lib.output import write_atomic
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+REPORT_INTERVAL = 5.0
+
+
+@attr.s
+class FleetJob(object):
+    id = attr.ib(validator=io(str))
+    inputs = attr.ib(validator=io(list))
+    output = attr.ib(validator=io(str))
+    options = attr.ib(validator=io(dict), factory=dict)
+
+    @classmethod
+    def from_config(cls, json_data: dict, number: int, defaults: dict, base_dir: str, output_dir: str):
+        job_id = str(json_data.get("id", f"job{number + 1}"))
+        inputs = json_data.get("input")
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        if not isinstance(inputs, list) or not inputs:
+            raise DataError(f"fleet job {job_id}: input must be a file name or a list of file names")
+        output = json_data.get("output", os.path.join(output_dir, f"{job_id}.json"))
+        options = dict(defaults)
+        options.update(json_data.get("options", {}))
+        return cls(
+            job_id,
+            [os.path.join(base_dir, i) for i in inputs],
+            os.path.join(base_dir, output),
+            options
+        )
+
+    @property
+    def digest(self) -> str:
+        return hashlib.blake2b(json.dumps(self.as_dict, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+@attr.s
+class FleetManifest(object):
+    jobs = attr.ib(validator=io(list))
+
+    @classmethod
+    def from_config(cls, json_data: dict, base_dir: str = "."):
+        defaults = json_data.get("defaults", {})
+        output_dir = json_data.get("output_dir", ".")
+        jobs = [FleetJob.from_config(j, n, defaults, base_dir, output_dir) for n, j in enumerate(json_data.get("jobs", []))]
+        seen = set()
+        for job in jobs:
+            if job.id in seen:
+                raise DataError(f"fleet job id {job.id} is not unique")
+            seen.add(job.id)
+        return cls(
+            jobs
+        )
+
+    @classmethod
+    def read(cls, file_name: str):
+        return cls.from_config(SizingConverter.read_file(file_name), os.path.dirname(os.path.abspath(file_name)))
+
+    @property
+    def as_dict(self):
+        return {"jobs": [j.as_dict for j in self.jobs]}
+
+
+class FleetJournal(object):
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.entries = {}
+        self.terminated = True
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.file_name, 'r') as journal_file:
+                for line in journal_file:
+                    self.terminated = line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[entry["id"]] = entry
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            raise InputFileReadError(f"can not read journal {self.file_name}: {err}")
+
+    def done(self, job: FleetJob, retry_failed: bool = True) -> bool:
+        entry = self.entries.get(job.id)
+        if entry is None or entry.get("digest") != job.digest:
+            return False
+        if entry.get("status") == "ok":
+            return os.path.exists(job.output)
+        return not retry_failed
+
+    def record(self, entry: dict):
+        self.entries[entry["id"]] = entry
+        with open(self.file_name, 'a') as journal_file:
+            journal_file.write(("" if self.terminated else "\n") + json.dumps(entry) + "\n")
+            self.terminated = True
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+
+def run_fleet_job(job: FleetJob) -> dict:
+    start = time.perf_counter()
+    result = {"id": job.id, "digest": job.digest, "output": job.output}
+    try:
+        document = SizingConverter(ConvertOptions(**dict(job.options, jobs=1, threads=1, output=job.output))).convert(job.inputs)
+        output_dir = os.path.dirname(os.path.abspath(job.output))
+        os.makedirs(output_dir, exist_ok=True)
+        write_atomic(document, job.output)
+        result.update(status="ok", clusters=len(document["clusters"]))
+    except Exception as err:
+        result.update(status="failed", error=f"{type(err).__name__}: {err}")
+    result.update(seconds=round(time.perf_counter() - start, 3), time=time.strftime('%Y-%m-%dT%H:%M:%S'))
+    return result
+
+
+@attr.s
+class FleetProgress(object):
+    total = attr.ib(validator=io(int))
+    completed = attr.ib(validator=io(int), default=0)
+    failed = attr.ib(validator=io(int), default=0)
+    skipped = attr.ib(validator=io(int), default=0)
+    started = attr.ib(validator=io(float), factory=time.monotonic)
+    reported = attr.ib(validator=io(float), default=0.0)
+    errors = attr.ib(validator=io(list), factory=list)
+
+    def add(self, result: dict):
+        if result["status"] == "ok":
+            self.completed += 1
+        else:
+            self.failed += 1
+            self.errors.append(result)
+        return self
+
+    @property
+    def finished(self) -> int:
+        return self.completed + self.failed
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.skipped - self.finished
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.finished / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        rate = self.rate
+        return self.remaining / rate if rate > 0 else None
+
+    @staticmethod
+    def duration(seconds: Optional[float]) -> str:
+        if seconds is None:
+            return "--:--:--"
+        seconds = int(seconds)
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+    def report(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.reported < REPORT_INTERVAL:
+            return
+        self.reported = now
+        logger.info("Fleet %d/%d done (%d failed, %d skipped), %.2f jobs/s, ETA %s",
+                    self.finished + self.skipped, self.total, self.failed, self.skipped, self.rate, self.duration(self.eta))
+
+    @property
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "seconds": time.monotonic() - self.started,
+            "errors": self.errors,
+        }
+
+
+class FleetRunner(object):
+
+    def __init__(self, manifest: FleetManifest, journal: FleetJournal, workers: int = 1, retry_failed: bool = True):
+        self.manifest = manifest
+        self.journal = journal
+        self.workers = max(1, workers)
+        self.retry_failed = retry_failed
+        self.progress = FleetProgress(len(manifest.jobs))
+
+    def pending(self) -> Iterator[FleetJob]:
+        for job in self.manifest.jobs:
+            if self.journal.done(job, self.retry_failed):
+                self.progress.skipped += 1
+                continue
+            yield job
+
+    def complete(self, result: dict):
+        self.journal.record(result)
+        self.progress.add(result)
+        if result["status"] == "ok":
+            logger.debug("Fleet job %s wrote %s in %ss", result['id'], result['output'], result['seconds'])
+        else:
+            logger.warning("Fleet job %s failed: %s", result['id'], result['error'])
+        self.progress.report()
+
+    def run(self) -> FleetProgress:
+        jobs = self.pending()
+        if self.workers == 1:
+            for job in jobs:
+                self.complete(run_fleet_job(job))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                running = set()
+                for job in jobs:
+                    running.add(executor.submit(run_fleet_job, job))
+                    if len(running) >= self.workers * 2:
+                        finished, running = wait(running, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            self.complete(future.result())
+                for future in wait(running).done:
+                    self.complete(future.result())
+        self.progress.report(force=True)
+        return self.progress
@@ -0,0 +1,247 @@
+##
+##
+
+import json
+import random
+import attr
+from attr.validators import instance_of as io
+
+KEY_SIZE_BUCKETS = ["(0-64)", "(65-256)", "(257-1024)", "(1025-4096)", "(4097-102400)", "(102401-max)"]
+
+
+@attr.s
+class CaptureSpec(object):
+    nodes = attr.ib(validator=io(int), default=3)
+    buckets = attr.ib(validator=io(int), default=2)
+    scopes = attr.ib(validator=io(int), default=2)
+    collections = attr.ib(validator=io(int), default=4)
+    indexes = attr.ib(validator=io(int), default=2)
+    partitions = attr.ib(validator=io(int), default=1)
+    replicas = attr.ib(validator=io(int), default=1)
+    clients = attr.ib(validator=io(int), default=4)
+    seed = attr.ib(validator=io(int), default=1)
+
+    @property
+    def collection_rows(self) -> int:
+        return self.buckets * self.scopes * self.collections * self.nodes
+
+    @property
+    def index_rows(self) -> int:
+        return self.buckets * self.scopes * self.collections * self.indexes * self.partitions * (self.replicas + 1)
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+class CaptureGenerator(object):
+
+    def __init__(self, spec: CaptureSpec = None):
+        self.spec = spec if spec else CaptureSpec()
+        self.rng = random.Random(self.spec.seed)
+        self.hosts = [f"host{n + 1}.example.com" for n in range(self.spec.nodes)]
+
+    def distribution(self) -> str:
+        counts = [self.rng.choice([0, 0, 1024, 65536, 1048576]) for _ in KEY_SIZE_BUCKETS]
+        return ", ".join(f"{b}:{c}" for b, c in zip(KEY_SIZE_BUCKETS, counts))
+
+    def data_record(self, bucket: str, hostname: str, items: int) -> dict:
+        gets = self.rng.randint(0, 100000)
+        sets = self.rng.randint(0, 100000)
+        return {
+            "ep_couch_bucket": bucket,
+            "hostname": hostname,
+            "cmd_get": gets,
+            "cmd_set": sets,
+            "curr_connections": self.rng.randint(10, 500),
+            "curr_items": items,
+            "curr_items_tot": items * 2,
+            "delete_hits": 0,
+            "delete_misses": 0,
+            "ep_active_datatype_json": 0,
+            "ep_active_datatype_raw": 0,
+            "ep_active_datatype_snappy": 0,
+            "ep_active_datatype_snappy,json": items,
+            "ep_bg_fetched": 0,
+            "ep_bg_meta_fetched": 0,
+            "ep_bucket_type": "persistent" if hostname else "",
+            "ep_kv_size": items * 1024,
+            "ep_max_size": items * 2048,
+            "ep_mem_high_wat": items * 1740,
+            "ep_mem_high_wat_percent": 0.85,
+            "ep_mem_low_wat": items * 1536,
+            "ep_mem_low_wat_percent": 0.75,
+            "ep_meta_data_memory": items * 64,
+            "ep_num_non_resident": 0,
+            "ep_replica_datatype_json": 0,
+            "ep_replica_datatype_raw": 0,
+            "ep_replica_datatype_snappy": 0,
+            "ep_replica_datatype_snappy,json": items,
+            "ep_value_size": items * 1000,
+            "get_hits": gets,
+            "get_misses": 0,
+            "mem_used": items * 1100,
+            "stat_reset": "2023-1-1T01:01:01",
+            "vb_active_curr_items": items,
+            "vb_active_itm_memory": items * 1000,
+            "vb_active_itm_memory_uncompressed": items * 2000,
+            "vb_active_meta_data_memory": items * 64,
+            "vb_active_ops_delete": 0,
+            "vb_active_perc_mem_resident": 100,
+            "vb_replica_curr_items": items,
+            "vb_replica_itm_memory": items * 1000,
+            "vb_replica_itm_memory_uncompressed": items * 2000,
+            "vb_replica_meta_data_memory": items * 64,
+            "vb_replica_ops_delete": 0,
+            "vb_replica_perc_mem_resident": 100,
+            "uptime": 12345678,
+            "avg_cmd_get": round(gets / 3600, 2),
+            "avg_cmd_set": round(sets / 3600, 2),
+            "avg_delete_hits": 0,
+            "avg_key_size": self.rng.choice([16, 32, 64]),
+            "avg_value_size": float(self.rng.choice([256, 1024, 4096])),
+            "memory_utilization_percent": 40.0,
+            "resident_ratio": self.rng.choice([20, 50, 100]),
+            "compression_ratio": 50.0,
+            "metadata_utilization_percent": 5.0,
+            "total_metadata_memory": items * 128
+        }
+
+    @staticmethod
+    def collection_record(bucket: str, scope: str, collection: str, node: str, items: int) -> dict:
+        return {
+            "bucket": bucket,
+            "scope_name": scope,
+            "collection_name": collection,
+            "node": node,
+            "mem_used": items * 1100,
+            "data_size": items * 1000,
+            "items": items,
+            "ops_delete": 0,
+            "ops_get": 0,
+            "ops_store": 0
+        }
+
+    def index_record(self, bucket: str, scope: str, collection: str, name: str, primary: bool, partition: int, replica: int) -> dict:
+        hostname = self.hosts[(partition + replica) % len(self.hosts)]
+        keyspace = f"`{bucket}`.`{scope}`.`{collection}`"
+        if primary:
+            definition = f"CREATE PRIMARY INDEX `{name}` ON {keyspace}"
+            sec_exprs = ""
+        else:
+            definition = f"CREATE INDEX `{name}` ON {keyspace}(`field`)"
+            sec_exprs = "`field`"
+        items = self.rng.randint(1000, 1000000)
+        return {
+            "bucket": bucket,
+            "scope": scope,
+            "collection": collection,
+            "indexName": name if replica == 0 else f"{name} (replica {replica})",
+            "hostname": hostname,
+            "hosts": f"{hostname}:8091",
+            "indexType": "plasma",
+            "definition": definition,
+            "secExprs": sec_exprs,
+            "where": None,
+            "partitioned": self.spec.partitions > 1,
+            "partitionId": partition,
+            "numPartition": self.spec.partitions,
+            "partitionMap": json.dumps({f"{hostname}:8091": [partition]}),
+            "replicaId": replica,
+            "lastScanTime": "Wed Mar  8 12:12:30 UTC 2023",
+            "arrkey_size_distribution": "",
+            "avg_array_length": 0,
+            "docid_count": 0,
+            "key_size_distribution": self.distribution(),
+            "avg_drain_rate": 0,
+            "avg_item_size": 256,
+            "avg_mutation_rate": self.rng.randint(0, 1000),
+            "avg_scan_latency": 0,
+            "avg_scan_rate": self.rng.randint(0, 1000),
+            "avg_scan_request_latency": 0,
+            "build_progress": 100,
+            "cache_hit_percent": 100,
+            "cache_hits": 1000000,
+            "cache_misses": 10000,
+            "data_size": items * 100,
+            "data_size_on_disk": items * 100,
+            "disk_size": items * 120,
+            "items_count": items,
+            "key_size_stats_since": "2023-01-01T00:00:00",
+            "last_known_scan_time": "2023-03-08T12:12:30",
+            "log_space_on_disk": items * 100,
+            "memory_used": items * 10,
+            "num_completed_requests": 0,
+            "num_completed_requests_aggr": 0,
+            "num_completed_requests_range": 0,
+            "num_docs_indexed": items,
+            "num_docs_pending": 0,
+            "num_docs_processed": 0,
+            "num_docs_queued": 0,
+            "num_rows_returned": 0,
+            "num_rows_returned_aggr": 0,
+            "num_rows_returned_range": 0,
+            "num_rows_scanned": 0,
+            "num_rows_scanned_aggr": 0,
+            "num_rows_scanned_range": 0,
+            "raw_data_size": items * 100,
+            "recs_in_mem": items,
+            "recs_on_disk": items,
+            "resident_percent": 100
+        }
+
+    def generate(self) -> dict:
+        spec = self.spec
+        capture = {
+            "data": [],
+            "clients": [],
+            "timings": [],
+            "collections": [],
+            "indexes": [],
+            "fts": [],
+            "fts_slow_queries": [],
+        }
+        for b in range(spec.buckets):
+            bucket = f"bucket{b}"
+            bucket_items = 0
+            for s in range(spec.scopes):
+                scope = "_default" if s == 0 else f"scope{s}"
+                for c in range(spec.collections):
+                    collection = "_default" if c == 0 else f"collection{c}"
+                    for node in self.hosts:
+                        items = self.rng.randint(1000, 100000)
+                        bucket_items += items
+                        capture["collections"].append(self.collection_record(bucket, scope, collection, node, items))
+                    for i in range(spec.indexes):
+                        primary = i == 0
+                        name = "#primary" if primary else f"adv_field{i}"
+                        for partition in range(spec.partitions):
+                            for replica in range(spec.replicas + 1):
+                                capture["indexes"].append(self.index_record(bucket, scope, collection, name, primary, partition, replica))
+            for node in self.hosts:
+                capture["data"].append(self.data_record(bucket, node, bucket_items // len(self.hosts)))
+            capture["data"].append(self.data_record(f"{bucket} totals:", "", bucket_items))
+            for n in range(spec.clients):
+                capture["clients"].append({
+                    "username": f"user{n}",
+                    "bucket": bucket,
+                    "bucket_index": b,
+                    "agent_name": "couchbase-python-client",
+                    "internal": False,
+                    "node": self.hosts[n % len(self.hosts)],
+                    "client_address": f"10.0.{b}.{n}",
+                    "connections": self.rng.randint(1, 50)
+                })
+            for node in self.hosts:
+                capture["timings"].append({
+                    "bucket": bucket,
+                    "stat": "get_cmd",
+                    "hostname": node,
+                    "avg": f"{self.rng.randint(1, 100)}us",
+                    "total": str(self.rng.randint(1000, 100000))
+                })
+        return capture
+
+    def write(self, file_name: str) -> None:
+        with open(file_name, 'w') as output_file:
+            json.dump(self.generate(), output_file)
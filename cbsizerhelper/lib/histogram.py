@@ -0,0 +1,71 @@
+##
+##
+
+import re
+import attr
+from functools import lru_cache
+from attr.validators import instance_of as io
+from cbsizerhelper.lib.exceptions import DataError
+
+DIST_ENTRY = re.compile(r"\s*\(\s*(\d+)\s*-\s*(\d+|max)\s*\)\s*:\s*(\d+)\s*")
+DIST_MAX = 102401
+DIST_DEFAULT = 64
+
+
+@attr.s(frozen=True, slots=True)
+class SizeHistogram(object):
+    buckets = attr.ib(validator=io(tuple))
+
+    @classmethod
+    def from_text(cls, text: str):
+        return parse_distribution(text)
+
+    @property
+    def total(self) -> int:
+        return sum(b[2] for b in self.buckets)
+
+    @property
+    def mode(self) -> int:
+        if len(self.buckets) == 0:
+            return DIST_DEFAULT
+        best = self.buckets[0]
+        for entry in self.buckets[1:]:
+            if entry[2] >= best[2]:
+                best = entry
+        return best[1]
+
+    @property
+    def mean(self) -> float:
+        total = self.total
+        if total == 0:
+            return float(self.mode)
+        return sum((b[0] + b[1]) / 2 * b[2] for b in self.buckets) / total
+
+    def percentile(self, percent: float) -> int:
+        total = self.total
+        if total == 0:
+            return self.mode
+        threshold = total * percent / 100
+        running = 0
+        for low, high, count in sorted(self.buckets):
+            running += count
+            if running >= threshold and count > 0:
+                return high
+        return sorted(self.buckets)[-1][1]
+
+    @property
+    def as_dict(self):
+        return {f"({b[0]}-{'max' if b[1] == DIST_MAX else b[1]})": b[2] for b in self.buckets}
+
+
+@lru_cache(maxsize=4096)
+def parse_distribution(text: str) -> SizeHistogram:
+    buckets = []
+    if len(text.strip()) > 0:
+        for entry in text.split(","):
+            match = DIST_ENTRY.fullmatch(entry)
+            if not match:
+                raise DataError(f"invalid size distribution entry \"{entry.strip()}\" in \"{text}\"")
+            low, high, count = match.groups()
+            buckets.append((int(low), DIST_MAX if high == "max" else int(high), int(count)))
+    return SizeHistogram(tuple(buckets))
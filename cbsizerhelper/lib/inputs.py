@@ -0,0 +1,104 @@
+##
+##
+
+import os
+import glob
+import attr
+from attr.validators import instance_of as io
+from typing import Union, Optional
+
+INPUT_PATTERNS = ("*.json", "*.json.gz", "*.json.xz", "*.json.zst")
+GLOB_CHARS = ("*", "?", "[")
+
+
+def output_files(output_file: Optional[str]) -> set[str]:
+    if not output_file:
+        return set()
+    return {os.path.realpath(output_file), os.path.realpath(f"{os.path.splitext(output_file)[0]}.profile.json")}
+
+
+@attr.s
+class SkippedInput(object):
+    path = attr.ib(validator=io(str))
+    reason = attr.ib(validator=io(str))
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+@attr.s
+class InputSet(object):
+    sources = attr.ib(validator=io(list), factory=list)
+    skipped = attr.ib(validator=io(list), factory=list)
+    seen = attr.ib(validator=io(set), factory=set)
+    outputs = attr.ib(validator=io(set), factory=set)
+
+    @classmethod
+    def build(cls, outputs: set[str] = None):
+        return cls(
+            [],
+            [],
+            set(),
+            outputs or set()
+        )
+
+    @classmethod
+    def expand(cls, entries: list[Union[str, dict]], outputs: set[str] = None):
+        inputs = cls.build(outputs)
+        for entry in entries:
+            if not isinstance(entry, str):
+                inputs.sources.append(entry)
+            elif os.path.isdir(entry):
+                inputs.directory(entry)
+            elif any(c in entry for c in GLOB_CHARS) and not os.path.exists(entry):
+                inputs.pattern(entry)
+            else:
+                inputs.file(entry)
+        return inputs
+
+    def directory(self, path: str):
+        matches = sorted(set(m for p in INPUT_PATTERNS for m in glob.glob(os.path.join(glob.escape(path), p))))
+        if not matches:
+            self.skip(path, "no sizing files in directory")
+        for match in matches:
+            self.match(match)
+
+    def pattern(self, pattern: str):
+        matches = sorted(m for m in glob.glob(pattern, recursive=True) if not os.path.isdir(m))
+        if not matches:
+            self.skip(pattern, "pattern matched no files")
+        for match in matches:
+            self.match(match)
+
+    def match(self, path: str):
+        if os.path.realpath(path) in self.outputs:
+            self.skip(path, "create_import output file")
+            return
+        self.file(path)
+
+    def file(self, path: str):
+        key = os.path.realpath(path)
+        if key in self.seen:
+            return
+        self.seen.add(key)
+        if not os.path.exists(path):
+            self.skip(path, "file not found")
+        elif not os.path.isfile(path):
+            self.skip(path, "not a regular file")
+        elif not os.access(path, os.R_OK):
+            self.skip(path, "permission denied")
+        elif os.path.getsize(path) == 0:
+            self.skip(path, "empty file")
+        else:
+            self.sources.append(path)
+
+    def skip(self, path: str, reason: str):
+        self.skipped.append(SkippedInput(path, reason))
+
+    @property
+    def as_dict(self):
+        return {
+            "sources": [s if isinstance(s, str) else "<dict>" for s in self.sources],
+            "skipped": [s.as_dict for s in self.skipped],
+        }
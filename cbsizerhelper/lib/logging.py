@@ -1,8 +1,17 @@
 ##
 ##
 
+import os
+import time
+import queue
+import multiprocessing
+import multiprocessing.queues
 import cbsizerhelper.lib.constants as C
 import logging
+import logging.handlers
+
+PROGRESS_INTERVAL = 5.0
+PROGRESS_CHECK = 256
 
 
 class CustomDisplayFormatter(logging.Formatter):
@@ -14,9 +23,14 @@ class CustomDisplayFormatter(logging.Formatter):
         logging.CRITICAL: f"[{C.BOLD_RED_COLOR}{C.FORMAT_LEVEL}{C.SCREEN_RESET}] {C.FORMAT_MESSAGE}"
     }
 
+    def __init__(self):
+        super().__init__()
+        self.formatters = {level: logging.Formatter(fmt) for level, fmt in self.FORMATS.items()}
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
+        formatter = self.formatters.get(record.levelno)
+        if formatter is None:
+            formatter = self.formatters[logging.DEBUG]
         return formatter.format(record)
 
 
@@ -29,7 +43,115 @@ class CustomLogFormatter(logging.Formatter):
         logging.CRITICAL: f"{C.FORMAT_TIMESTAMP} [{C.FORMAT_LEVEL}] ({C.FORMAT_THREAD}) {C.FORMAT_MESSAGE}"
     }
 
+    def __init__(self):
+        super().__init__()
+        self.formatters = {level: logging.Formatter(fmt) for level, fmt in self.FORMATS.items()}
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
+        formatter = self.formatters.get(record.levelno)
+        if formatter is None:
+            formatter = self.formatters[logging.DEBUG]
         return formatter.format(record)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.deferred = True
+
+    def prepare(self, record):
+        if self.deferred:
+            return record
+        return super().prepare(record)
+
+
+class ChildLogQueue(multiprocessing.queues.SimpleQueue):
+
+    def __init__(self):
+        super().__init__(ctx=multiprocessing.get_context())
+
+    def put_nowait(self, item):
+        self.put(item)
+
+    def get(self, block: bool = True):
+        return super().get()
+
+
+class BackgroundLogWriter(object):
+    active = None
+    fork_hook = False
+
+    def __init__(self, handler: logging.Handler):
+        self.handler = handler
+        self.queue = queue.SimpleQueue()
+        self.child_queue = ChildLogQueue()
+        self.queue_handler = DeferredQueueHandler(self.queue)
+        self.queue_handler.setLevel(handler.level)
+        self.listener = logging.handlers.QueueListener(self.queue, handler, respect_handler_level=True)
+        self.child_listener = logging.handlers.QueueListener(self.child_queue, handler, respect_handler_level=True)
+        self.running = []
+
+    def start(self):
+        self.running = [self.listener, self.child_listener]
+        for listener in self.running:
+            listener.start()
+        BackgroundLogWriter.active = self
+        BackgroundLogWriter.register_fork_hook()
+        return self
+
+    def stop(self):
+        if BackgroundLogWriter.active is self:
+            BackgroundLogWriter.active = None
+        while self.running:
+            self.running.pop().stop()
+        self.handler.flush()
+
+    def after_fork(self):
+        self.listener.stop()
+        self.running = []
+        self.queue = self.child_queue
+        self.listener = logging.handlers.QueueListener(self.child_queue, self.handler, respect_handler_level=True)
+        self.child_listener = self.listener
+        self.queue_handler.queue = self.child_queue
+        self.queue_handler.deferred = False
+
+    @classmethod
+    def register_fork_hook(cls):
+        if not cls.fork_hook and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=cls.after_fork_in_child)
+            cls.fork_hook = True
+
+    @classmethod
+    def after_fork_in_child(cls):
+        if cls.active is not None:
+            cls.active.after_fork()
+            cls.active = None
+
+
+class ProgressReporter(object):
+
+    def __init__(self, logger: logging.Logger, summary: bool = False, interval: float = PROGRESS_INTERVAL):
+        self.logger = logger
+        self.summary = summary
+        self.interval = interval
+        self.counts = {}
+        self.pending = 0
+        self.last = time.monotonic()
+
+    def item(self, kind: str, message: str, *args):
+        if not self.summary:
+            self.logger.info(message, *args)
+            return
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.pending += 1
+        if self.pending >= PROGRESS_CHECK:
+            self.pending = 0
+            now = time.monotonic()
+            if now - self.last >= self.interval:
+                self.last = now
+                self.report()
+
+    def report(self):
+        if self.summary and self.counts:
+            self.logger.info("Progress: %s", ", ".join(f"{count} {kind}" for kind, count in self.counts.items()))
@@ -0,0 +1,228 @@
+##
+##
+
+import attr
+from attr.validators import instance_of as io
+from enum import Enum
+from cbsizerhelper.lib.schema import ValidateMode
+from cbsizerhelper.lib.exceptions import InputFileProcessError
+from cbsizerhelper.lib.aggregate import IndexReplicaMap
+from cbsizerhelper.lib.sizing import ClusterConfig, ClusterConfigData, ClusterConfigCollections
+
+TOTALS_SUFFIX = " totals:"
+
+
+class MergeRule(Enum):
+    sum = "sum"
+    max = "max"
+    first = "first"
+
+
+# bucket totals from inputs with disjoint node sets (or rebuilt from distinct node rows when they overlap) combine per field:
+# counters, byte sizes and per-node rates add up; per-item averages, ratios and percentages take the most conservative (largest) value
+DATA_MERGE_RULES = {
+    "ep_couch_bucket": MergeRule.first,
+    "hostname": MergeRule.first,
+    "cmd_get": MergeRule.sum,
+    "cmd_set": MergeRule.sum,
+    "curr_connections": MergeRule.sum,
+    "curr_items": MergeRule.sum,
+    "curr_items_tot": MergeRule.sum,
+    "delete_hits": MergeRule.sum,
+    "delete_misses": MergeRule.sum,
+    "ep_active_datatype_json": MergeRule.sum,
+    "ep_active_datatype_raw": MergeRule.sum,
+    "ep_active_datatype_snappy": MergeRule.sum,
+    "ep_active_datatype_snappy_json": MergeRule.sum,
+    "ep_bg_fetched": MergeRule.sum,
+    "ep_bg_meta_fetched": MergeRule.sum,
+    "ep_bucket_type": MergeRule.first,
+    "ep_kv_size": MergeRule.sum,
+    "ep_max_size": MergeRule.sum,
+    "ep_mem_high_wat": MergeRule.sum,
+    "ep_mem_high_wat_percent": MergeRule.max,
+    "ep_mem_low_wat": MergeRule.sum,
+    "ep_mem_low_wat_percent": MergeRule.max,
+    "ep_meta_data_memory": MergeRule.sum,
+    "ep_num_non_resident": MergeRule.sum,
+    "ep_replica_datatype_json": MergeRule.sum,
+    "ep_replica_datatype_raw": MergeRule.sum,
+    "ep_replica_datatype_snappy": MergeRule.sum,
+    "ep_replica_datatype_snappy_json": MergeRule.sum,
+    "ep_value_size": MergeRule.sum,
+    "get_hits": MergeRule.sum,
+    "get_misses": MergeRule.sum,
+    "mem_used": MergeRule.sum,
+    "stat_reset": MergeRule.first,
+    "vb_active_curr_items": MergeRule.sum,
+    "vb_active_meta_data_memory": MergeRule.sum,
+    "vb_active_ops_delete": MergeRule.sum,
+    "vb_active_perc_mem_resident": MergeRule.max,
+    "vb_replica_curr_items": MergeRule.sum,
+    "vb_replica_meta_data_memory": MergeRule.sum,
+    "vb_replica_ops_delete": MergeRule.sum,
+    "vb_replica_perc_mem_resident": MergeRule.max,
+    "uptime": MergeRule.max,
+    "avg_cmd_get": MergeRule.sum,
+    "avg_cmd_set": MergeRule.sum,
+    "avg_delete_hits": MergeRule.sum,
+    "avg_key_size": MergeRule.max,
+    "avg_value_size": MergeRule.max,
+    "memory_utilization_percent": MergeRule.max,
+    "resident_ratio": MergeRule.max,
+    "compression_ratio": MergeRule.max,
+    "metadata_utilization_percent": MergeRule.max,
+    "total_metadata_memory": MergeRule.sum,
+    "vb_active_itm_memory": MergeRule.sum,
+    "vb_active_itm_memory_uncompressed": MergeRule.sum,
+    "vb_replica_itm_memory": MergeRule.sum,
+    "vb_replica_itm_memory_uncompressed": MergeRule.sum,
+}
+
+
+def merge_values(rule: MergeRule, values: list):
+    present = [v for v in values if v is not None]
+    if not present:
+        return None
+    if rule == MergeRule.sum:
+        return sum(present)
+    elif rule == MergeRule.max:
+        return max(present)
+    return present[0]
+
+
+def merge_records(records: list[ClusterConfigData], **overrides) -> ClusterConfigData:
+    fields = {name: merge_values(rule, [getattr(r, name) for r in records]) for name, rule in DATA_MERGE_RULES.items()}
+    fields.update(overrides)
+    return ClusterConfigData(**fields)
+
+
+@attr.s
+class BucketMerge(object):
+    name = attr.ib(validator=io(str))
+    totals = attr.ib(validator=io(dict), factory=dict)
+    nodes = attr.ib(validator=io(dict), factory=dict)
+    hosts = attr.ib(validator=io(dict), factory=dict)
+    keyspace_hosts = attr.ib(validator=io(dict), factory=dict)
+
+    @classmethod
+    def build(cls, name: str):
+        return cls(
+            name,
+            {},
+            {},
+            {},
+            {}
+        )
+
+    def add(self, source: int, record: ClusterConfigData):
+        if record.ep_couch_bucket.endswith(TOTALS_SUFFIX):
+            self.totals[source] = record
+        else:
+            self.nodes[record.hostname] = record
+            self.hosts.setdefault(source, set()).add(record.hostname)
+        return self
+
+    def keyspace_node(self, source: int, node: str):
+        if node:
+            self.keyspace_hosts.setdefault(source, set()).add(node)
+        return self
+
+    def sources(self) -> list[int]:
+        return sorted(set(self.totals) | set(self.hosts))
+
+    def node_set(self, source: int) -> frozenset:
+        return frozenset(self.hosts.get(source) or self.keyspace_hosts.get(source, ()))
+
+    def records(self) -> list[ClusterConfigData]:
+        node_sets = [self.node_set(source) for source in self.totals]
+        union = frozenset().union(*node_sets)
+        if len(self.totals) == 1 or not all(node_sets) or len(set(node_sets)) == 1:
+            return [list(self.totals.values())[-1]]
+        if self.totals and sum(len(n) for n in node_sets) == len(union) and union.issuperset(self.nodes.keys()):
+            return [merge_records(list(self.totals.values()))]
+        if self.nodes:
+            return [merge_records(list(self.nodes.values()), ep_couch_bucket=f"{self.name}{TOTALS_SUFFIX}", hostname="")]
+        if self.totals:
+            return [merge_records(list(self.totals.values()))]
+        return []
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+@attr.s
+class ConfigMerge(object):
+    buckets = attr.ib(validator=io(dict), factory=dict)
+    collections = attr.ib(validator=io(dict), factory=dict)
+    indexes = attr.ib(validator=io(dict), factory=dict)
+    count = attr.ib(validator=io(int), default=0)
+    names = attr.ib(validator=io(list), factory=list)
+
+    @classmethod
+    def build(cls):
+        return cls(
+            {},
+            {},
+            {},
+            0,
+            []
+        )
+
+    @classmethod
+    def from_configs(cls, configs: list[ClusterConfig]):
+        merge = cls.build()
+        for config in configs:
+            merge.add(config)
+        return merge
+
+    def add(self, config: ClusterConfig, name: str = None):
+        source = self.count
+        self.count += 1
+        self.names.append(name or f"<input {self.count}>")
+        for record in config.data:
+            name = record.ep_couch_bucket[:-len(TOTALS_SUFFIX)] if record.ep_couch_bucket.endswith(TOTALS_SUFFIX) else record.ep_couch_bucket
+            bucket = self.buckets.get(name)
+            if bucket is None:
+                bucket = self.buckets[name] = BucketMerge.build(name)
+            bucket.add(source, record)
+        for record in config.collections:
+            self.collections[(record.bucket, record.scope_name, record.collection_name, record.node)] = record
+            bucket = self.buckets.get(record.bucket)
+            if bucket is not None:
+                bucket.keyspace_node(source, record.node)
+        for record in config.indexes:
+            key = (record.bucket, record.scope, record.collection, IndexReplicaMap.base_name(record.indexName), record.partitionId, record.replicaId)
+            self.indexes[key] = record
+        return self
+
+    @property
+    def data(self) -> list[ClusterConfigData]:
+        data = []
+        for bucket in self.buckets.values():
+            try:
+                data.extend(bucket.records())
+            except TypeError as err:
+                files = ", ".join(self.names[source] for source in bucket.sources())
+                raise InputFileProcessError(f"can not merge bucket {bucket.name} from sizing file(s) {files}: {err}")
+        return data
+
+    def config(self, validate: ValidateMode = ValidateMode.FULL) -> ClusterConfig:
+        data = self.data
+        collections = list(self.collections.values())
+        keyspaces = set(record.bucket for record in collections)
+        for record in data:
+            name = record.ep_couch_bucket[:-len(TOTALS_SUFFIX)]
+            if name not in keyspaces:
+                collections.append(ClusterConfigCollections(name, "_default", "_default", "", 0, 0, int(record.curr_items), 0, 0, 0))
+        records = {
+            "data": data,
+            "collections": collections,
+            "indexes": list(self.indexes.values()),
+        }
+        return ClusterConfig({}, validate, records)
+
+    @property
+    def as_dict(self):
+        return self.__dict__
@@ -0,0 +1,39 @@
+##
+##
+
+import attr
+from attr.validators import instance_of as io
+
+
+@attr.s
+class UniqueNames(object):
+    names = attr.ib(validator=io(set))
+    counters = attr.ib(validator=io(dict))
+
+    @classmethod
+    def build(cls):
+        return cls(
+            set(),
+            {}
+        )
+
+    def unique(self, name: str) -> str:
+        if name not in self.names:
+            self.names.add(name)
+            return name
+        n = self.counters.get(name, 1)
+        while f"{name}_{n}" in self.names:
+            n += 1
+        self.counters[name] = n + 1
+        unique_name = f"{name}_{n}"
+        self.names.add(unique_name)
+        return unique_name
+
+    def apply(self, entries: list[dict], key: str = "name"):
+        for entry in entries:
+            entry[key] = self.unique(entry[key])
+        return self
+
+    @property
+    def as_dict(self):
+        return self.__dict__
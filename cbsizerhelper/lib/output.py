@@ -0,0 +1,112 @@
+##
+##
+
+import os
+import tempfile
+from typing import Optional, IO
+from cbsizerhelper.lib import codec
+from cbsizerhelper.lib.codec import INDENT
+
+
+def file_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+FILE_MODE = file_mode()
+
+
+class AtomicFile(object):
+
+    def __init__(self, file_name: str, mode: str = 'w'):
+        self.file_name = file_name
+        self.mode = mode
+        self.temp_name = None
+        self.file: Optional[IO] = None
+
+    def open(self) -> IO:
+        directory = os.path.dirname(os.path.abspath(self.file_name))
+        fd, self.temp_name = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(self.file_name)}.", suffix=".tmp")
+        os.chmod(self.temp_name, FILE_MODE)
+        self.file = os.fdopen(fd, self.mode)
+        return self.file
+
+    def commit(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.temp_name, self.file_name)
+
+    def discard(self):
+        self.file.close()
+        try:
+            os.remove(self.temp_name)
+        except OSError:
+            pass
+
+    def __enter__(self) -> IO:
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+
+def encode(data, compact: bool = False) -> str:
+    return codec.dumps(data, compact)
+
+
+def write_atomic(data: dict, file_name: str, compact: bool = False) -> None:
+    with AtomicFile(file_name) as output_file:
+        output_file.write(encode(data, compact))
+        output_file.write("\n")
+
+
+class SizingDocumentWriter(object):
+
+    def __init__(self, header: dict, file_name: str, compact: bool = False):
+        self.header = {k: v for k, v in header.items() if k != "clusters"}
+        self.file_name = file_name
+        self.compact = compact
+        self.atomic = AtomicFile(file_name)
+        self.file: Optional[IO] = None
+        self.count = 0
+
+    def open(self):
+        self.file = self.atomic.open()
+        if self.compact:
+            self.file.write(encode(self.header, True)[:-1] + ',"clusters":[')
+        else:
+            self.file.write(encode(self.header)[:-2] + ',\n' + ' ' * INDENT + '"clusters": [')
+        return self
+
+    def cluster(self, cluster: dict):
+        separator = "," if self.count else ""
+        if self.compact:
+            self.file.write(separator + encode(cluster, True))
+        else:
+            margin = "\n" + " " * (INDENT * 2)
+            self.file.write(separator + margin + encode(cluster).replace("\n", margin))
+        self.count += 1
+        return self
+
+    def close(self):
+        if self.compact or not self.count:
+            self.file.write("]}\n" if self.compact else "]\n}\n")
+        else:
+            self.file.write("\n" + " " * INDENT + "]\n}\n")
+        self.atomic.commit()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.atomic.discard()
+        return False
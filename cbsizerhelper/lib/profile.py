@@ -0,0 +1,122 @@
+##
+##
+
+import time
+import threading
+import tracemalloc
+import attr
+from attr.validators import instance_of as io
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@attr.s
+class PhaseRecord(object):
+    name = attr.ib(validator=io(str))
+    calls = attr.ib(validator=io(int), default=0)
+    wall_time = attr.ib(validator=io(float), default=0.0)
+    cpu_time = attr.ib(validator=io(float), default=0.0)
+    peak_memory = attr.ib(validator=io(int), default=0)
+    concurrent_calls = attr.ib(validator=io(int), default=0)
+    counts = attr.ib(validator=io(dict), factory=dict)
+
+    def count(self, **counts: int):
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+        return self
+
+    def merge(self, other: dict):
+        self.calls += other.get("calls", 0)
+        self.wall_time += other.get("wall_time", 0.0)
+        self.cpu_time += other.get("cpu_time", 0.0)
+        self.peak_memory = max(self.peak_memory, other.get("peak_memory", 0))
+        self.concurrent_calls += other.get("concurrent_calls", 0)
+        self.count(**other.get("counts", {}))
+        return self
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+class PhaseProfiler(object):
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.active = 0
+        self.overlaps = 0
+        self.lock = threading.Lock()
+        if self.enabled and self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def disabled(cls):
+        return cls(enabled=False)
+
+    def get(self, name: str) -> PhaseRecord:
+        with self.lock:
+            record = self.phases.get(name)
+            if record is None:
+                record = self.phases[name] = PhaseRecord(name)
+            return record
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseRecord]:
+        if not self.enabled:
+            yield PhaseRecord(name)
+            return
+        record = self.get(name)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        with self.lock:
+            if self.active:
+                self.overlaps += 1
+            self.active += 1
+            start_overlaps = self.overlaps
+            if tracing and self.active == 1:
+                tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+        start_wall = time.perf_counter()
+        start_cpu = time.thread_time()
+        try:
+            yield record
+        finally:
+            with self.lock:
+                concurrent = self.overlaps != start_overlaps or self.active > 1
+                self.active -= 1
+                if concurrent:
+                    self.overlaps += 1
+                record.calls += 1
+                record.wall_time += time.perf_counter() - start_wall
+                record.cpu_time += time.thread_time() - start_cpu
+                if concurrent:
+                    record.concurrent_calls += 1
+                elif tracing:
+                    record.peak_memory = max(record.peak_memory, tracemalloc.get_traced_memory()[1] - start_memory)
+
+    def merge(self, phases: dict):
+        for name, data in phases.items():
+            self.get(name).merge(data)
+        return self
+
+    def reset(self):
+        self.phases = {}
+        return self
+
+    def stop(self):
+        if self.enabled and self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @property
+    def as_dict(self):
+        return {name: record.as_dict for name, record in self.phases.items()}
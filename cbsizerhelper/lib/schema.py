@@ -0,0 +1,52 @@
+##
+##
+
+import attr
+from enum import Enum
+from cbsizerhelper.lib.exceptions import DataError
+
+SAMPLE_SIZE = 256
+
+
+class ValidateMode(Enum):
+    FULL = "full"
+    SAMPLE = "sample"
+    OFF = "off"
+
+
+class SectionSchema(object):
+
+    def __init__(self, record_class: type):
+        self.name = record_class.__name__
+        self.columns = []
+        for field in attr.fields(record_class):
+            validator = field.validator
+            optional = False
+            if validator is not None and hasattr(validator, "validator"):
+                optional = True
+                validator = validator.validator
+            if validator is None or not hasattr(validator, "type"):
+                continue
+            self.columns.append((field.name, validator.type, optional))
+
+    @staticmethod
+    def sample(count: int) -> list[int]:
+        if count <= SAMPLE_SIZE:
+            return list(range(count))
+        step = count // SAMPLE_SIZE
+        indices = list(range(0, count, step))
+        if indices[-1] != count - 1:
+            indices.append(count - 1)
+        return indices
+
+    def validate(self, section: str, records: list, mode: ValidateMode = ValidateMode.FULL):
+        if mode == ValidateMode.OFF:
+            return
+        indices = range(len(records)) if mode == ValidateMode.FULL else self.sample(len(records))
+        for name, types, optional in self.columns:
+            for n in indices:
+                value = getattr(records[n], name)
+                if value is None and optional:
+                    continue
+                if not isinstance(value, types):
+                    raise DataError(f"{section} record {n}: field {name} must be {types} (got {value!r} that is a {type(value)})")
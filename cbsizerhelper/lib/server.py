@@ -0,0 +1,216 @@
+##
+##
+
+import time
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional
+import attr
+from attr.validators import instance_of as io
+from cbsizerhelper import __version__
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter
+from cbsizerhelper.lib import codec
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_MAX_BODY = 256 * 1024 * 1024
+LATENCY_WINDOW = 1024
+WORKER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+REQUEST_OPTIONS = tuple(a.name for a in attr.fields(ConvertOptions) if a.name not in ("jobs", "threads", "cache_dir", "cache_size"))
+
+
+def warm_worker() -> int:
+    return 0
+
+
+def convert_request(captures: list, options: dict) -> tuple[Optional[dict], Optional[str]]:
+    try:
+        return SizingConverter(ConvertOptions(**options, jobs=1, threads=1)).convert(captures), None
+    except Exception as err:
+        return None, str(err)
+
+
+@attr.s
+class ServerStats(object):
+    started = attr.ib(validator=io(float), factory=time.time)
+    requests = attr.ib(validator=io(int), default=0)
+    completed = attr.ib(validator=io(int), default=0)
+    failed = attr.ib(validator=io(int), default=0)
+    rejected = attr.ib(validator=io(int), default=0)
+    in_flight = attr.ib(validator=io(int), default=0)
+    bytes_in = attr.ib(validator=io(int), default=0)
+    bytes_out = attr.ib(validator=io(int), default=0)
+    latencies = attr.ib(validator=io(deque), factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    lock = attr.ib(factory=threading.Lock)
+
+    def begin(self, size: int):
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.bytes_in += size
+
+    def end(self, latency: float, size: int, success: bool):
+        with self.lock:
+            self.in_flight -= 1
+            self.bytes_out += size
+            if success:
+                self.completed += 1
+                self.latencies.append(latency)
+            else:
+                self.failed += 1
+
+    def reject(self):
+        with self.lock:
+            self.rejected += 1
+
+    @staticmethod
+    def percentile(values: list[float], percent: float) -> float:
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))]
+
+    @property
+    def as_dict(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            uptime = time.time() - self.started
+            return {
+                "version": __version__,
+                "uptime": uptime,
+                "requests": self.requests,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "in_flight": self.in_flight,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "throughput": self.completed / uptime if uptime > 0 else 0.0,
+                "latency": {
+                    "samples": len(latencies),
+                    "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+                    "p50": self.percentile(latencies, 50),
+                    "p95": self.percentile(latencies, 95),
+                    "p99": self.percentile(latencies, 99),
+                    "max": latencies[-1] if latencies else 0.0,
+                },
+            }
+
+
+class ConversionHandler(BaseHTTPRequestHandler):
+    server: 'ConversionServer'
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug("%s " + format, self.address_string(), *args)
+
+    def reply(self, status: int, body: dict, headers: Optional[dict] = None) -> int:
+        payload = codec.dumps(body, compact=True).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        return len(payload)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.reply(200, self.server.stats.as_dict)
+        elif self.path == "/health":
+            self.reply(200, {"status": "ok"})
+        else:
+            self.reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/convert":
+            self.close_connection = True
+            self.reply(404, {"error": f"unknown path {self.path}"})
+            return
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.close_connection = True
+            self.reply(411, {"error": "Content-Length required"})
+            return
+        try:
+            length = int(length)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.close_connection = True
+            self.reply(400, {"error": f"invalid Content-Length {self.headers.get('Content-Length')}"})
+            return
+        if length > self.server.max_body:
+            self.close_connection = True
+            self.reply(413, {"error": f"request body exceeds {self.server.max_body} bytes"})
+            return
+        if not self.server.slots.acquire(blocking=False):
+            self.server.stats.reject()
+            self.close_connection = True
+            self.reply(503, {"error": "server busy"}, {"Retry-After": "1"})
+            return
+        try:
+            self.convert(length)
+        finally:
+            self.server.slots.release()
+
+    def convert(self, length: int):
+        start = time.perf_counter()
+        self.server.stats.begin(length)
+        status = 400
+        size = 0
+        try:
+            try:
+                request = codec.loads(self.rfile.read(length))
+                captures = request["captures"]
+                options = request.get("options", {})
+                if not isinstance(captures, list) or not all(isinstance(c, dict) for c in captures) or not captures:
+                    raise ValueError("captures must be a non-empty list of sizing captures")
+                unknown = set(options) - set(REQUEST_OPTIONS)
+                if unknown:
+                    raise ValueError(f"unknown option(s): {', '.join(sorted(unknown))}")
+            except (ValueError, KeyError, TypeError) as err:
+                size = self.reply(400, {"error": f"invalid request: {err}"})
+                return
+            document, error = self.server.executor.submit(convert_request, captures, options).result()
+            if error:
+                status = 422
+                size = self.reply(422, {"error": error})
+            else:
+                status = 200
+                size = self.reply(200, document)
+        except Exception as err:
+            status = 500
+            size = self.reply(500, {"error": str(err)})
+        finally:
+            self.server.stats.end(time.perf_counter() - start, size, status == 200)
+
+
+class ConversionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 2, queue: int = 8, max_body: int = DEFAULT_MAX_BODY):
+        super().__init__((host, port), ConversionHandler)
+        self.workers = max(1, workers)
+        self.max_body = max_body
+        self.slots = threading.BoundedSemaphore(self.workers + max(0, queue))
+        self.stats = ServerStats()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+                                            initializer=codec.set_default_codec, initargs=(codec.default_codec().name,))
+        for future in [self.executor.submit(warm_worker) for _ in range(self.workers)]:
+            future.result()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -3,14 +3,15 @@
 
 import os
 import attr
-import ast
 import time
 from attr.validators import instance_of as io
 import uuid
 from datetime import date
 from enum import Enum
 from cbsizerhelper.lib.exceptions import DataError
-from typing import Optional
+from cbsizerhelper.lib.schema import SectionSchema, ValidateMode
+from cbsizerhelper.lib.histogram import parse_distribution
+from typing import Optional, Iterable, Callable, Any
 
 
 def positive(value):
@@ -23,28 +24,115 @@ def round_num(value):
     return round(value, 2)
 
 
+def record_builder(record_class: type) -> Callable[[tuple], Any]:
+    targets = ", ".join(f"record.{f.name}" for f in attr.fields(record_class))
+    source = f"def build(values):\n    record = new(cls)\n    {targets}, = values\n    return record\n"
+    namespace = {"new": object.__new__, "cls": record_class}
+    exec(source, namespace)
+    return namespace["build"]
+
+
 @attr.s
 class ClusterConfig(object):
-    data = attr.ib(validator=io(list))
-    clients = attr.ib(validator=io(list))
-    timings = attr.ib(validator=io(list))
-    collections = attr.ib(validator=io(list))
-    indexes = attr.ib(validator=io(list))
-    fts = attr.ib(validator=io(list))
-    fts_slow_queries = attr.ib(validator=io(list))
+    sections = attr.ib(validator=io(dict))
+    validate = attr.ib(validator=io(ValidateMode), default=ValidateMode.FULL)
+    records = attr.ib(validator=io(dict), factory=dict)
+    columns = attr.ib(validator=io(dict), factory=dict)
 
     @classmethod
-    def from_config(cls, json_data: dict):
+    def from_config(cls, json_data: dict, validate: ValidateMode = ValidateMode.FULL):
+        return cls(
+            {k: json_data.get(k, []) for k in SECTION_NAMES},
+            validate
+            )
+
+    @classmethod
+    def from_stream(cls, records: Iterable[tuple[str, Any]], sections: dict[str, Optional[Callable[[dict], bool]]], validate: ValidateMode = ValidateMode.FULL):
+        config = {k: [] for k in SECTION_NAMES}
+        for section, record in records:
+            if section not in config or section not in sections:
+                continue
+            keep = sections[section]
+            if keep is not None and not keep(record):
+                continue
+            config[section].append(record)
         return cls(
-            [ClusterConfigData.from_config(e) for e in json_data.get("data", [])],
-            [ClusterConfigClients.from_config(e) for e in json_data.get("clients", [])],
-            [ClusterConfigTimings.from_config(e) for e in json_data.get("timings", [])],
-            [ClusterConfigCollections.from_config(e) for e in json_data.get("collections", [])],
-            [ClusterConfigIndexes.from_config(e) for e in json_data.get("indexes", [])],
-            json_data.get("fts", []),
-            json_data.get("fts_slow_queries", []),
+            config,
+            validate
             )
 
+    def section(self, name: str) -> list:
+        records = self.records.get(name)
+        if records is None and name in self.columns:
+            records = self.records[name] = self.columns[name].records()
+        elif records is None:
+            record_class = SECTION_CLASSES.get(name)
+            raw = self.sections.get(name, [])
+            if record_class:
+                records = []
+                builder = SECTION_BUILDERS[name]
+                for n, entry in enumerate(raw):
+                    try:
+                        records.append(builder(record_class.values(entry)))
+                    except (TypeError, ValueError) as err:
+                        raise DataError(f"{name} record {n}: {err}")
+                SECTION_SCHEMAS[name].validate(name, records, self.validate)
+            else:
+                records = raw
+            self.records[name] = records
+            self.sections.pop(name, None)
+        return records
+
+    def columnar(self, name: str):
+        if name in self.records:
+            return None
+        return self.columns.get(name)
+
+    def count(self, name: str) -> int:
+        table = self.columnar(name)
+        if table is not None:
+            return table.rows
+        return len(self.section(name))
+
+    def primary_indexes(self) -> list:
+        table = self.columnar("indexes")
+        if table is not None:
+            return table.records(table.select("replicaId", lambda v: not v > 0))
+        return [r for r in self.indexes if not r.replicaId > 0]
+
+    def load(self, *names: str):
+        for name in names:
+            self.section(name)
+        return self
+
+    @property
+    def data(self) -> list:
+        return self.section("data")
+
+    @property
+    def clients(self) -> list:
+        return self.section("clients")
+
+    @property
+    def timings(self) -> list:
+        return self.section("timings")
+
+    @property
+    def collections(self) -> list:
+        return self.section("collections")
+
+    @property
+    def indexes(self) -> list:
+        return self.section("indexes")
+
+    @property
+    def fts(self) -> list:
+        return self.section("fts")
+
+    @property
+    def fts_slow_queries(self) -> list:
+        return self.section("fts_slow_queries")
+
     def default_collection(self, bucket: str, items: int):
         collection_data = {
             "bucket": bucket,
@@ -58,14 +146,14 @@ class ClusterConfig(object):
             "ops_get": 0,
             "ops_store": 0
         }
-        self.collections.append(ClusterConfigCollections.from_config(collection_data))
+        return ClusterConfigCollections.from_config(collection_data)
 
     @property
     def as_dict(self):
-        return self.__dict__
+        return {k: self.section(k) for k in SECTION_NAMES}
 
 
-@attr.s
+@attr.s(slots=True)
 class ClusterConfigData(object):
     ep_couch_bucket = attr.ib(validator=io(str))
     hostname = attr.ib(validator=io(str))
@@ -126,7 +214,11 @@ class ClusterConfigData(object):
 
     @classmethod
     def from_config(cls, json_data: dict):
-        return cls(
+        return cls(*cls.values(json_data))
+
+    @staticmethod
+    def values(json_data: dict) -> tuple:
+        return (
             json_data.get("ep_couch_bucket"),
             json_data.get("hostname"),
             json_data.get("cmd_get"),
@@ -187,7 +279,7 @@ class ClusterConfigData(object):
 
     @property
     def as_dict(self):
-        block = {k: v for k, v in self.__dict__.items() if v is not None}
+        block = attr.asdict(self, recurse=False, filter=lambda a, v: v is not None)
         return block
 
 
@@ -204,7 +296,11 @@ class ClusterConfigClients(object):
 
     @classmethod
     def from_config(cls, json_data: dict):
-        return cls(
+        return cls(*cls.values(json_data))
+
+    @staticmethod
+    def values(json_data: dict) -> tuple:
+        return (
             json_data.get("username"),
             json_data.get("bucket"),
             json_data.get("bucket_index"),
@@ -230,7 +326,11 @@ class ClusterConfigTimings(object):
 
     @classmethod
     def from_config(cls, json_data: dict):
-        return cls(
+        return cls(*cls.values(json_data))
+
+    @staticmethod
+    def values(json_data: dict) -> tuple:
+        return (
             json_data.get("bucket"),
             json_data.get("stat"),
             json_data.get("hostname"),
@@ -243,7 +343,7 @@ class ClusterConfigTimings(object):
         return self.__dict__
 
 
-@attr.s
+@attr.s(slots=True)
 class ClusterConfigCollections(object):
     bucket = attr.ib(validator=io(str))
     scope_name = attr.ib(validator=io(str))
@@ -258,7 +358,11 @@ class ClusterConfigCollections(object):
 
     @classmethod
     def from_config(cls, json_data: dict):
-        return cls(
+        return cls(*cls.values(json_data))
+
+    @staticmethod
+    def values(json_data: dict) -> tuple:
+        return (
             json_data.get("bucket"),
             json_data.get("scope_name"),
             json_data.get("collection_name"),
@@ -273,10 +377,10 @@ class ClusterConfigCollections(object):
 
     @property
     def as_dict(self):
-        return self.__dict__
+        return attr.asdict(self, recurse=False)
 
 
-@attr.s
+@attr.s(slots=True)
 class ClusterConfigIndexes(object):
     bucket = attr.ib(validator=io(str))
     scope = attr.ib(validator=io(str))
@@ -336,7 +440,11 @@ class ClusterConfigIndexes(object):
 
     @classmethod
     def from_config(cls, json_data: dict):
-        return cls(
+        return cls(*cls.values(json_data))
+
+    @staticmethod
+    def values(json_data: dict) -> tuple:
+        return (
             json_data.get("bucket"),
             json_data.get("scope"),
             json_data.get("collection"),
@@ -396,7 +504,19 @@ class ClusterConfigIndexes(object):
 
     @property
     def as_dict(self):
-        return self.__dict__
+        return attr.asdict(self, recurse=False)
+
+
+SECTION_CLASSES = {
+    "data": ClusterConfigData,
+    "clients": ClusterConfigClients,
+    "timings": ClusterConfigTimings,
+    "collections": ClusterConfigCollections,
+    "indexes": ClusterConfigIndexes,
+}
+SECTION_SCHEMAS = {k: SectionSchema(v) for k, v in SECTION_CLASSES.items()}
+SECTION_BUILDERS = {k: record_builder(v) for k, v in SECTION_CLASSES.items()}
+SECTION_NAMES = list(SECTION_CLASSES.keys()) + ["fts", "fts_slow_queries"]
 
 
 @attr.s
@@ -606,6 +726,7 @@ class SizingCluster(object):
 @attr.s
 class SizingClusterBuckets(object):
     buckets = attr.ib(validator=io(list))
+    _names = attr.ib(validator=io(dict), factory=dict)
 
     @classmethod
     def build(cls):
@@ -613,25 +734,23 @@ class SizingClusterBuckets(object):
             []
         )
 
-    def bucket(self, bucket: dict):
-        self.buckets.append(bucket)
+    def bucket(self, bucket: 'SizingClusterBucket'):
+        self.buckets.append(bucket.as_dict)
+        self._names.setdefault(bucket.name, bucket)
         return self
 
     def get_bucket(self, name: str):
-        for entry in self.buckets:
-            if entry["name"] == name:
-                return SizingClusterBucket.from_config(entry)
-        raise DataError(f"Bucket {name} not found")
+        bucket = self._names.get(name)
+        if bucket is None:
+            raise DataError(f"Bucket {name} not found")
+        return bucket
 
     def bucket_exists(self, name: str) -> bool:
-        for entry in self.buckets:
-            if entry["name"] == name:
-                return True
-        return False
+        return name in self._names
 
     @property
     def as_dict(self):
-        return self.__dict__
+        return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
 
 
 @attr.s
@@ -668,10 +787,11 @@ class SizingClusterBucket(object):
     in_memory_compression_ratio = attr.ib(validator=io(float))
     on_disk_compression_ratio = attr.ib(validator=io(float))
     scopes = attr.ib(validator=io(list))
+    _names = attr.ib(validator=io(dict), factory=dict)
 
     @classmethod
     def from_config(cls, json_data: dict):
-        return cls(
+        bucket = cls(
             json_data.get("id"),
             json_data.get("name"),
             json_data.get("description"),
@@ -684,14 +804,14 @@ class SizingClusterBucket(object):
             json_data.get("default_compression"),
             json_data.get("in_memory_compression_ratio"),
             json_data.get("on_disk_compression_ratio"),
-            [SizingClusterScope.from_config(s) for s in json_data.get("scopes", [])],
+            [],
         )
+        for s in json_data.get("scopes", []):
+            bucket.scope(SizingClusterScope.from_config(s))
+        return bucket
 
     def get_scope(self, name: str):
-        for scope in self.scopes:
-            if scope.name == name:
-                return scope
-        return None
+        return self._names.get(name)
 
     @classmethod
     def build(cls, bucket_id: str, name: str, config: ClusterConfigData):
@@ -713,13 +833,14 @@ class SizingClusterBucket(object):
             []
         )
 
-    def scope(self, scope: dict):
-        self.scopes.append(scope)
+    def scope(self, scope: 'SizingClusterScope'):
+        self.scopes.append(scope.as_dict)
+        self._names.setdefault(scope.name, scope)
         return self
 
     @property
     def as_dict(self):
-        return self.__dict__
+        return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
 
 
 @attr.s
@@ -727,20 +848,24 @@ class SizingClusterScope(object):
     id = attr.ib(validator=io(str))
     name = attr.ib(validator=io(str))
     collections = attr.ib(validator=io(list))
+    _names = attr.ib(validator=io(dict), factory=dict)
 
     @classmethod
     def from_config(cls, json_data: dict):
-        return cls(
+        scope = cls(
             json_data.get("id"),
             json_data.get("name"),
-            [SizingClusterCollection.from_config(c) for c in json_data.get("collections", [])],
+            [],
         )
+        for c in json_data.get("collections", []):
+            scope.collection(SizingClusterCollection.from_config(c))
+        return scope
 
     def get_collection(self, name: str):
-        for collection in self.collections:
-            if collection.name == name:
-                return collection
-        raise DataError(f"Collection {name} not found")
+        collection = self._names.get(name)
+        if collection is None:
+            raise DataError(f"Collection {name} not found")
+        return collection
 
     @classmethod
     def build(cls, scope_id: str, name: str):
@@ -750,13 +875,14 @@ class SizingClusterScope(object):
             []
         )
 
-    def collection(self, collection: dict):
-        self.collections.append(collection)
+    def collection(self, collection: 'SizingClusterCollection'):
+        self.collections.append(collection.as_dict)
+        self._names.setdefault(collection.name, collection)
         return self
 
     @property
     def as_dict(self):
-        return self.__dict__
+        return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
 
 
 @attr.s
@@ -951,19 +1077,7 @@ class SizingClusterIndexEntry(object):
 
     @staticmethod
     def calc_dist_value(text: str) -> int:
-        if len(text) == 0:
-            return 64
-        s = text
-        s = s.replace('(', '"(')
-        s = s.replace(')', ')"')
-        s = '{' + s
-        s = s + '}'
-        dist = ast.literal_eval(s)
-        highest = [k for k, v in sorted(dist.items(), key=lambda item: item[1])][-1]
-        value = highest.split('-')[-1].strip(')')
-        if value == 'max':
-            value = 102401
-        return int(value)
+        return parse_distribution(text).mode
 
     @property
     def as_dict(self):
@@ -0,0 +1,69 @@
+##
+##
+
+import io
+import gzip
+import lzma
+import mmap
+import os
+from enum import Enum
+from typing import BinaryIO, TextIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MMAP_THRESHOLD = 16 * 1024 * 1024
+MAGIC_SIZE = 6
+
+
+class Compression(Enum):
+    none = b""
+    gzip = b"\x1f\x8b"
+    xz = b"\xfd7zXZ\x00"
+    zstd = b"\x28\xb5\x2f\xfd"
+
+
+class SourceFile(object):
+
+    def __init__(self, file_name: str, mmap_threshold: int = MMAP_THRESHOLD):
+        self.file_name = file_name
+        self.mmap_threshold = mmap_threshold
+        self.compression = self.detect(file_name)
+
+    @staticmethod
+    def detect(file_name: str) -> Compression:
+        with open(file_name, 'rb') as input_file:
+            magic = input_file.read(MAGIC_SIZE)
+        for compression in Compression:
+            if compression.value and magic.startswith(compression.value):
+                return compression
+        return Compression.none
+
+    def open_binary(self) -> BinaryIO:
+        if self.compression == Compression.gzip:
+            return gzip.open(self.file_name, 'rb')
+        elif self.compression == Compression.xz:
+            return lzma.open(self.file_name, 'rb')
+        elif self.compression == Compression.zstd:
+            if zstandard is None:
+                raise ValueError("zstandard compressed input requires the zstandard package (pip install cbsizerhelper[zstd])")
+            return zstandard.ZstdDecompressor().stream_reader(open(self.file_name, 'rb'), closefd=True)
+        return open(self.file_name, 'rb')
+
+    def open_text(self) -> TextIO:
+        return io.TextIOWrapper(self.open_binary(), encoding='utf-8')
+
+    def read_text(self) -> str:
+        if self.compression != Compression.none:
+            with self.open_binary() as input_file:
+                return input_file.read().decode('utf-8')
+        with open(self.file_name, 'rb') as input_file:
+            size = os.fstat(input_file.fileno()).st_size
+            if size < self.mmap_threshold:
+                return input_file.read().decode('utf-8')
+            with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                return str(mapped, 'utf-8')
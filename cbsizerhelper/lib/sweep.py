@@ -0,0 +1,141 @@
+##
+##
+
+import copy
+import uuid
+import itertools
+import attr
+from attr.validators import instance_of as io
+from typing import Iterator
+from cbsizerhelper.lib.exceptions import DataError
+from cbsizerhelper.lib.sizing import SizingConfig, CloudRegion, ClusterInfrastructure, CloudService, CloudHardware
+
+SWEEP_KEYS = ("bucket_ratio", "index_ratio", "read", "write", "delete", "cloud")
+
+
+@attr.s
+class Scenario(object):
+    values = attr.ib(validator=io(dict))
+
+    @property
+    def label(self) -> str:
+        return ",".join(f"{k}={v}" for k, v in self.values.items())
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+@attr.s
+class ScenarioGrid(object):
+    axes = attr.ib(validator=io(dict))
+
+    @classmethod
+    def from_config(cls, json_data: dict):
+        axes = {}
+        for key, values in json_data.items():
+            if key not in SWEEP_KEYS:
+                raise DataError(f"unknown sweep parameter {key} (expected one of {', '.join(SWEEP_KEYS)})")
+            if not isinstance(values, list) or len(values) == 0:
+                raise DataError(f"sweep parameter {key} must be a non-empty list")
+            if key == "cloud":
+                for value in values:
+                    if value not in CloudRegion.__members__:
+                        raise DataError(f"sweep cloud {value} should be aws, gcp, azure, or vm")
+            axes[key] = values
+        return cls(
+            axes
+        )
+
+    @property
+    def scenarios(self) -> list[Scenario]:
+        keys = list(self.axes.keys())
+        return [Scenario(dict(zip(keys, combination))) for combination in itertools.product(*self.axes.values())]
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+class ScenarioSweep(object):
+
+    def __init__(self, clusters: list[dict]):
+        self.clusters = clusters
+        self.collections = []
+        self.indexes = []
+        self.base = {}
+        for cluster in self.clusters:
+            for bucket in cluster["services"].get("data", {}).get("buckets", []):
+                for scope in bucket["scopes"]:
+                    self.collections.extend(scope["collections"])
+            self.indexes.extend(cluster["services"].get("index", {}).get("indexes", []))
+        self.base["working_set"] = [c["working_set"] for c in self.collections]
+        self.base["read_ops_per_sec"] = [c["read_ops_per_sec"] for c in self.collections]
+        self.base["write_ops_per_sec"] = [c["write_ops_per_sec"] for c in self.collections]
+        self.base["delete_ops_per_sec"] = [c["delete_ops_per_sec"] for c in self.collections]
+        self.base["resident_ratio"] = [i["resident_ratio"] for i in self.indexes]
+        self.base["cloud"] = [(c["cloud_provider"], c["cloud_region"], c["infrastructure"], c["cloud_service"], [g["hardware"] for g in c["service_groups"]])
+                              for c in self.clusters]
+        self.base["name"] = [c["name"] for c in self.clusters]
+
+    @staticmethod
+    def assign(entries: list[dict], field: str, values: list):
+        for entry, value in zip(entries, values):
+            entry[field] = value
+
+    def apply(self, scenario: Scenario):
+        values = scenario.values
+        count = len(self.collections)
+        working_set = int(values["bucket_ratio"]) / 100 if "bucket_ratio" in values else None
+        self.assign(self.collections, "working_set", [working_set] * count if working_set is not None else self.base["working_set"])
+        for key, field in (("read", "read_ops_per_sec"), ("write", "write_ops_per_sec")):
+            value = round(float(values[key]), 2) if key in values else None
+            self.assign(self.collections, field, [value] * count if value is not None else self.base[field])
+        delete = float(values["delete"]) if "delete" in values else None
+        self.assign(self.collections, "delete_ops_per_sec", [delete] * count if delete is not None else self.base["delete_ops_per_sec"])
+        resident_ratio = float(int(values["index_ratio"]) / 100) if "index_ratio" in values else None
+        self.assign(self.indexes, "resident_ratio", [resident_ratio] * len(self.indexes) if resident_ratio is not None else self.base["resident_ratio"])
+
+        for cluster, name, base in zip(self.clusters, self.base["name"], self.base["cloud"]):
+            cluster["name"] = f"{name} [{scenario.label}]" if scenario.label else name
+            if "cloud" in values:
+                cloud = values["cloud"]
+                cluster["cloud_provider"] = cloud
+                cluster["cloud_region"] = CloudRegion[cloud].value
+                cluster["infrastructure"] = ClusterInfrastructure[cloud].value
+                cluster["cloud_service"] = CloudService[cloud].value
+                for group in cluster["service_groups"]:
+                    group["hardware"] = CloudHardware[cloud].value
+            else:
+                cluster["cloud_provider"], cluster["cloud_region"], cluster["infrastructure"], cluster["cloud_service"], hardware = base
+                for group, group_hardware in zip(cluster["service_groups"], hardware):
+                    group["hardware"] = group_hardware
+        return self
+
+    @staticmethod
+    def renew_ids(clusters: list[dict]) -> list[dict]:
+        for cluster in clusters:
+            cluster["id"] = str(uuid.uuid4())
+            for group in cluster["service_groups"]:
+                group["id"] = str(uuid.uuid4())
+        return clusters
+
+    def snapshot(self) -> list[dict]:
+        return self.renew_ids(copy.deepcopy(self.clusters))
+
+    def documents(self, scenarios: list[Scenario]) -> Iterator[tuple[Scenario, dict]]:
+        # clusters are patched in place, so each document must be consumed before the next is requested
+        for scenario in scenarios:
+            self.apply(scenario)
+            sizer_config = SizingConfig.build()
+            for cluster in self.renew_ids(self.clusters):
+                sizer_config.cluster(cluster)
+            yield scenario, sizer_config.as_dict
+
+    def combined(self, scenarios: list[Scenario]) -> dict:
+        sizer_config = SizingConfig.build()
+        for scenario in scenarios:
+            self.apply(scenario)
+            for cluster in self.snapshot():
+                sizer_config.cluster(cluster)
+        return sizer_config.as_dict
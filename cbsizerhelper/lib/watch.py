@@ -0,0 +1,167 @@
+##
+##
+
+import os
+import time
+import logging
+import threading
+import attr
+from attr.validators import instance_of as io
+from typing import Optional, Callable
+from cbsizerhelper.lib.cache import ParseCache
+from cbsizerhelper.lib.convert import SizingConverter
+from cbsizerhelper.lib.inputs import InputSet, output_files
+from cbsizerhelper.lib.output import write_atomic
+from cbsizerhelper.lib.sizing import ClusterConfig, SizingConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_DEBOUNCE = 2.0
+
+
+@attr.s
+class WatchedFile(object):
+    path = attr.ib(validator=io(str))
+    signature = attr.ib(validator=io(tuple))
+    changed = attr.ib(validator=io(float))
+    content_hash = attr.ib(validator=attr.validators.optional(io(str)), default=None)
+    config = attr.ib(validator=attr.validators.optional(io(ClusterConfig)), default=None)
+    cluster = attr.ib(validator=attr.validators.optional(io(dict)), default=None)
+
+    @property
+    def settled(self) -> bool:
+        return self.content_hash is not None
+
+    @property
+    def as_dict(self):
+        return self.__dict__
+
+
+class InputWatcher(object):
+
+    def __init__(self,
+                 entries: list[str],
+                 converter: SizingConverter,
+                 output_file: str,
+                 interval: float = DEFAULT_INTERVAL,
+                 debounce: float = DEFAULT_DEBOUNCE,
+                 writer: Callable[[dict, str], None] = write_atomic,
+                 clock: Callable[[], float] = time.monotonic):
+        self.entries = entries
+        self.converter = converter
+        self.output_file = output_file
+        self.interval = interval
+        self.debounce = debounce
+        self.writer = writer
+        self.clock = clock
+        self.files = {}
+        self.order = []
+        self.written = []
+        self.outputs = output_files(output_file)
+        self.stopped = threading.Event()
+
+    @staticmethod
+    def signature(path: str) -> Optional[tuple]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def changed_at(self, now: float, signature: tuple) -> float:
+        return now - max(0.0, time.time() - signature[1] / 1e9)
+
+    def scan(self) -> bool:
+        now = self.clock()
+        paths = [p for p in InputSet.expand(self.entries, self.outputs).sources if os.path.realpath(p) not in self.outputs]
+        self.order = paths
+        dirty = False
+
+        for path in set(self.files) - set(paths):
+            logger.info("Input %s removed", path)
+            del self.files[path]
+
+        for path in paths:
+            signature = self.signature(path)
+            if signature is None:
+                continue
+            watched = self.files.get(path)
+            if watched is None:
+                watched = self.files[path] = WatchedFile(path, signature, self.changed_at(now, signature))
+            elif watched.signature != signature:
+                watched.signature = signature
+                watched.changed = self.changed_at(now, signature)
+            if now - watched.changed >= self.debounce:
+                dirty = self.refresh(watched) or dirty
+        return dirty or self.ready_paths() != self.written
+
+    def ready_paths(self) -> list[str]:
+        return [p for p in self.order if p in self.files and self.files[p].config is not None]
+
+    def refresh(self, watched: WatchedFile) -> bool:
+        try:
+            content_hash = ParseCache.file_hash(watched.path)
+        except OSError as err:
+            logger.warning("Can not read %s: %s", watched.path, err)
+            return False
+        watched.changed = float("inf")
+        if content_hash == watched.content_hash:
+            return False
+        try:
+            config = self.converter.load(watched.path)
+            cluster = self.converter.process(1, [config])
+        except Exception as err:
+            logger.warning("Keeping previous version of %s: %s", watched.path, err)
+            watched.content_hash = content_hash
+            return False
+        logger.info("Input %s %s", watched.path, 'updated' if watched.settled else 'added')
+        watched.content_hash = content_hash
+        watched.config = config
+        watched.cluster = cluster
+        return True
+
+    def document(self) -> dict:
+        sizer_config = SizingConfig.build()
+        ready = [self.files[p] for p in self.ready_paths()]
+        if not ready:
+            return sizer_config.as_dict
+        if self.converter.options.combine:
+            config = self.converter.merge([w.config for w in ready])
+            sizer_config.cluster(self.converter.process(1, [config]))
+            return sizer_config.as_dict
+        for count, watched in enumerate(ready):
+            if watched.cluster is None:
+                watched.cluster = self.converter.process(count + 1, [watched.config])
+            watched.cluster["name"] = f"{self.converter.name}{count + 1}"
+            sizer_config.cluster(watched.cluster)
+        return sizer_config.as_dict
+
+    def poll(self) -> bool:
+        if not self.scan():
+            return False
+        try:
+            document = self.document()
+        except Exception as err:
+            logger.error("Can not convert %s: %s", ", ".join(self.ready_paths()), err)
+            return False
+        try:
+            self.writer(document, self.output_file)
+        except OSError as err:
+            logger.error("Can not write output file %s: %s", self.output_file, err)
+            return False
+        self.written = self.ready_paths()
+        logger.info("Wrote %d cluster(s) to %s", len(document['clusters']), self.output_file)
+        return True
+
+    def run(self, cycles: Optional[int] = None) -> None:
+        count = 0
+        while not self.stopped.is_set():
+            self.poll()
+            count += 1
+            if cycles is not None and count >= cycles:
+                break
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
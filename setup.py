@@ -20,6 +20,11 @@ setup(
     install_requires=[
         "attrs>=19.3.0",
     ],
+    extras_require={
+        "zstd": ["zstandard"],
+        "orjson": ["orjson"],
+        "msgspec": ["msgspec"],
+    },
     author_email='info@unix.us.com',
     description='Sizer Helper',
     long_description=long_description,
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import shutil
+import tempfile
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter, convert
+from cbsizerhelper.lib.exceptions import InputFileReadError
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from cbsizerhelper.lib.inputs import InputSet, output_files
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'sample_data.json')
+
+
+def bucket_names(document: dict) -> list:
+    return [[b['name'] for b in c['services']['data']['buckets']] for c in document['clusters']]
+
+
+class TestInputs(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.work_dir, "nodes"))
+        for n in range(6):
+            CaptureGenerator(CaptureSpec(buckets=n + 1, seed=n)).write(os.path.join(self.work_dir, "nodes", f"node{n}.json"))
+        shutil.copy(input_path, os.path.join(self.work_dir, "sample.json"))
+        open(os.path.join(self.work_dir, "nodes", "empty.json"), 'w').close()
+        open(os.path.join(self.work_dir, "nodes", "notes.txt"), 'w').close()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_1(self):
+        nodes = os.path.join(self.work_dir, "nodes")
+        inputs = InputSet.expand([os.path.join(self.work_dir, "sample.json"), nodes, os.path.join(self.work_dir, "**", "node*.json"),
+                                  os.path.join(self.work_dir, "missing.json"), os.path.join(self.work_dir, "*.yaml")])
+        assert inputs.sources == [os.path.join(self.work_dir, "sample.json")] + [os.path.join(nodes, f"node{n}.json") for n in range(6)]
+        assert [(os.path.basename(s.path), s.reason) for s in inputs.skipped] == [("empty.json", "empty file"),
+                                                                                   ("missing.json", "file not found"),
+                                                                                   ("*.yaml", "pattern matched no files")]
+
+    def test_2(self):
+        nodes = os.path.join(self.work_dir, "nodes")
+        sequential = convert([nodes], ConvertOptions(threads=1))
+        threaded = convert([nodes], ConvertOptions(threads=4))
+        assert bucket_names(threaded) == bucket_names(sequential)
+        assert [len(b) for b in bucket_names(threaded)] == [1, 2, 3, 4, 5, 6]
+        combined = convert([os.path.join(nodes, "*.json")], ConvertOptions(threads=3, combine=True))
+        assert len(combined['clusters']) == 1
+        assert bucket_names(combined)[0] == [f"bucket{n}" for n in range(6)]
+
+    def test_3(self):
+        with self.assertRaises(InputFileReadError):
+            convert([os.path.join(self.work_dir, "*.yaml")])
+
+    def test_4(self):
+        nodes = os.path.join(self.work_dir, "nodes")
+        with open(os.path.join(nodes, "node3.json"), 'w') as bad_file:
+            bad_file.write('{"data": [')
+        shutil.copy(os.path.join(nodes, "node0.json"), os.path.join(nodes, "cluster_config.json"))
+        shutil.copy(os.path.join(nodes, "node0.json"), os.path.join(nodes, "cluster_config.profile.json"))
+        output = os.path.join(nodes, "cluster_config.json")
+        for options in (ConvertOptions(threads=1, output=output), ConvertOptions(threads=4, output=output), ConvertOptions(jobs=2, output=output)):
+            converter = SizingConverter(options)
+            document = converter.convert([nodes])
+            assert [len(b) for b in bucket_names(document)] == [1, 2, 3, 5, 6]
+            assert [c['name'] for c in document['clusters']] == [f"Cluster{n}" for n in range(1, 6)]
+            assert [(os.path.basename(s.path), s.reason.split(":")[0]) for s in converter.skipped] == [
+                ("cluster_config.json", "create_import output file"),
+                ("cluster_config.profile.json", "create_import output file"),
+                ("empty.json", "empty file"),
+                ("node3.json", f"can not read sizing file {os.path.join(nodes, 'node3.json')}")]
+        converter = SizingConverter(ConvertOptions(threads=4, combine=True))
+        combined = converter.convert([nodes])
+        assert bucket_names(combined)[0] == [f"bucket{n}" for n in range(6)]
+        assert os.path.basename(converter.skipped[-1].path) == "node3.json"
+        assert len(InputSet.expand([output]).sources) == 1
+        assert len(InputSet.expand([nodes]).sources) == 8
+        renamed = InputSet.expand([nodes], output_files(os.path.join(nodes, "node0.json")))
+        assert os.path.join(nodes, "node0.json") not in renamed.sources
+        assert os.path.join(nodes, "cluster_config.json") in renamed.sources
+
+
+if __name__ == '__main__':
+    unittest.main()
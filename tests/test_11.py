@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+import shutil
+import tempfile
+import attr
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter, convert
+from cbsizerhelper.lib.exceptions import InputFileProcessError
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from cbsizerhelper.lib.merge import DATA_MERGE_RULES
+from cbsizerhelper.lib.sizing import ClusterConfigData
+
+warnings.filterwarnings("ignore")
+
+
+def split_by_node(capture: dict) -> list[dict]:
+    parts = []
+    hosts = [r["hostname"] for r in capture["data"] if r["hostname"]]
+    for host in dict.fromkeys(hosts):
+        part = {k: [] for k in capture}
+        for record in capture["data"]:
+            if record["hostname"] == host:
+                part["data"].append(record)
+                part["data"].append(dict(record, ep_couch_bucket=f"{record['ep_couch_bucket']} totals:", hostname=""))
+        part["collections"] = [r for r in capture["collections"] if r["node"] == host]
+        part["indexes"] = [r for r in capture["indexes"] if r["hostname"] == host]
+        parts.append(part)
+    return parts
+
+
+def strip_ids(value):
+    if isinstance(value, dict):
+        return {k: strip_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return [strip_ids(v) for v in value]
+    return value
+
+
+def keyspace_totals(cluster: dict) -> dict:
+    return {(b['name'], s['name'], c['name']): c['total_documents_keys']
+            for b in cluster['services']['data']['buckets'] for s in b['scopes'] for c in s['collections']}
+
+
+def index_totals(cluster: dict) -> dict:
+    return {(i['name'], i['bucket'], i['scope'], i['collection']): (i['absolute_documents_in_index'], i['number_replicas'])
+            for i in cluster['services']['index']['indexes']}
+
+
+class TestMerge(unittest.TestCase):
+
+    def test_1(self):
+        assert set(DATA_MERGE_RULES.keys()) == set(a.name for a in attr.fields(ClusterConfigData))
+
+    def test_2(self):
+        capture = CaptureGenerator(CaptureSpec(nodes=3, buckets=2, scopes=2, collections=3, indexes=2, partitions=3, replicas=1, seed=7)).generate()
+        whole = convert([capture])['clusters'][0]
+        merged = convert(split_by_node(capture), ConvertOptions(combine=True))['clusters'][0]
+        assert [b['name'] for b in merged['services']['data']['buckets']] == ['bucket0', 'bucket1']
+        assert keyspace_totals(merged) == keyspace_totals(whole)
+        assert index_totals(merged) == index_totals(whole)
+
+    def test_3(self):
+        capture = CaptureGenerator(CaptureSpec(nodes=2, buckets=3, partitions=2, seed=3)).generate()
+        once = convert([capture], ConvertOptions(combine=True))['clusters'][0]
+        twice = convert([capture, capture, capture], ConvertOptions(combine=True))['clusters'][0]
+        assert keyspace_totals(twice) == keyspace_totals(once)
+        assert index_totals(twice) == index_totals(once)
+        assert twice['services']['query'] == once['services']['query']
+
+    def test_4(self):
+        work_dir = tempfile.mkdtemp()
+        try:
+            capture = CaptureGenerator(CaptureSpec(nodes=3, buckets=2, partitions=2, seed=5)).generate()
+            files = [os.path.join(work_dir, name) for name in ("a.json", "b.json")]
+            for file_name in files:
+                with open(file_name, 'w') as output_file:
+                    json.dump(capture, output_file)
+            once = strip_ids(convert(files[:1], ConvertOptions(combine=True))['clusters'][0])
+            for stream in (False, True):
+                twice = strip_ids(convert(files, ConvertOptions(combine=True, stream=stream))['clusters'][0])
+                assert twice == once, stream
+            exported = SizingConverter(ConvertOptions(stream=True)).export_columnar(files, os.path.join(work_dir, "columnar"))
+            twice = strip_ids(convert([e[1] for e in exported], ConvertOptions(combine=True))['clusters'][0])
+            assert twice == once
+            whole = convert([capture])['clusters'][0]
+            parts = [os.path.join(work_dir, f"node{n}.json") for n in range(3)]
+            for file_name, part in zip(parts, split_by_node(capture)):
+                with open(file_name, 'w') as output_file:
+                    json.dump(part, output_file)
+            merged = convert(parts, ConvertOptions(combine=True, stream=True))['clusters'][0]
+            assert keyspace_totals(merged) == keyspace_totals(whole)
+        finally:
+            shutil.rmtree(work_dir)
+
+    def test_5(self):
+        capture = CaptureGenerator(CaptureSpec(nodes=3, buckets=2, seed=9)).generate()
+        totals = {k: [] for k in capture}
+        totals["data"] = [r for r in capture["data"] if r["ep_couch_bucket"].endswith(" totals:")]
+        once = convert([totals], ConvertOptions(combine=True))['clusters'][0]
+        twice = convert([totals, totals], ConvertOptions(combine=True))['clusters'][0]
+        assert keyspace_totals(once) == {(f"bucket{n}", "_default", "_default"): int(r["curr_items"]) for n, r in enumerate(totals["data"])}
+        assert keyspace_totals(twice) == keyspace_totals(once)
+        assert strip_ids(twice['services']['data']) == strip_ids(once['services']['data'])
+
+    def test_6(self):
+        work_dir = tempfile.mkdtemp()
+        try:
+            capture = CaptureGenerator(CaptureSpec(nodes=2, buckets=1, seed=4)).generate()
+            files = []
+            for n, part in enumerate(split_by_node(capture)):
+                for record in part["data"]:
+                    if record["ep_couch_bucket"].endswith(" totals:"):
+                        del record["cmd_get"]
+                files.append(os.path.join(work_dir, f"node{n}.json"))
+                with open(files[-1], 'w') as output_file:
+                    json.dump(part, output_file)
+            with self.assertRaises(InputFileProcessError) as context:
+                convert(files, ConvertOptions(combine=True, validate="off"))
+            for file_name in files:
+                assert file_name in context.exception.message
+        finally:
+            shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+import socket
+import threading
+import urllib.request
+import urllib.error
+from cbsizerhelper.lib.convert import ConvertOptions, convert
+from cbsizerhelper.lib.server import ConversionServer
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'sample_data.json')
+
+
+def post(url: str, body: bytes) -> tuple[int, dict]:
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as err:
+        return err.code, json.load(err)
+
+
+class TestServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ConversionServer(port=0, workers=1, queue=0, max_body=64 * 1024)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        with open(input_path, 'r') as input_file:
+            cls.capture = json.load(input_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_1(self):
+        body = json.dumps({"captures": [self.capture], "options": {"cloud": "azure", "name": "Portal"}}).encode()
+        status, document = post(f"{self.server.url}/convert", body)
+        assert status == 200
+        expected = convert([self.capture], ConvertOptions(cloud="azure", name="Portal"))
+        cluster = document['clusters'][0]
+        assert cluster['name'] == "Portal1"
+        assert cluster['services'] == expected['clusters'][0]['services']
+
+    def test_2(self):
+        assert post(f"{self.server.url}/convert", b"not json")[0] == 400
+        assert post(f"{self.server.url}/convert", json.dumps({"captures": [self.capture], "options": {"jobs": 8}}).encode())[0] == 400
+        status, body = post(f"{self.server.url}/convert", json.dumps({"captures": [{"data": [{"hostname": 1}]}]}).encode())
+        assert status == 422
+        assert "data" in body["error"] and body["error"] != "conversion failed"
+        assert post(f"{self.server.url}/convert", b" " * (64 * 1024 + 1))[0] == 413
+
+    def test_3(self):
+        self.server.slots.acquire()
+        try:
+            status, body = post(f"{self.server.url}/convert", json.dumps({"captures": [self.capture]}).encode())
+        finally:
+            self.server.slots.release()
+        assert status == 503
+        with urllib.request.urlopen(f"{self.server.url}/stats", timeout=30) as response:
+            stats = json.load(response)
+        assert stats['rejected'] >= 1
+        assert stats['in_flight'] == 0
+        assert stats['requests'] == stats['completed'] + stats['failed']
+        assert stats['latency']['samples'] == stats['completed']
+
+    def raw_post(self, length: str) -> tuple[int, dict]:
+        host, port = self.server.server_address[:2]
+        with socket.create_connection((host, port), timeout=30) as connection:
+            connection.sendall(f"POST /convert HTTP/1.1\r\nHost: {host}\r\nContent-Length: {length}\r\n\r\n".encode())
+            response = connection.makefile('rb')
+            status = int(response.readline().split()[1])
+            headers = {}
+            while True:
+                line = response.readline().strip()
+                if not line:
+                    break
+                name, value = line.decode().split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+            return status, json.loads(response.read(int(headers["content-length"])))
+
+    def test_4(self):
+        for length in ("abc", "-1", "1.5"):
+            status, body = self.raw_post(length)
+            assert status == 400, length
+            assert "Content-Length" in body["error"]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+import time
+import shutil
+import tempfile
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter, convert
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from cbsizerhelper.lib.schema import ValidateMode
+from cbsizerhelper.lib.watch import InputWatcher
+
+warnings.filterwarnings("ignore")
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingConverter(SizingConverter):
+
+    def __init__(self, options: ConvertOptions):
+        super().__init__(options)
+        self.loaded = []
+
+    def load(self, source):
+        if isinstance(source, str):
+            self.loaded.append(os.path.basename(source))
+        return super().load(source)
+
+
+class TestWatch(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.work_dir, "drop")
+        os.makedirs(self.input_dir)
+        self.output_file = os.path.join(self.work_dir, "out.json")
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def capture(self, name: str, seed: int, age: float = 60.0) -> str:
+        path = os.path.join(self.input_dir, name)
+        CaptureGenerator(CaptureSpec(buckets=2, seed=seed)).write(path)
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def watcher(self, combine: bool = False, output_file: str = None) -> InputWatcher:
+        converter = CountingConverter(ConvertOptions(combine=combine, threads=1))
+        return InputWatcher([self.input_dir], converter, output_file if output_file else self.output_file, debounce=5.0, clock=self.clock)
+
+    def output(self) -> dict:
+        with open(self.output_file, 'r') as output_file:
+            return json.load(output_file)
+
+    def test_1(self):
+        self.capture("a.json", 1)
+        watcher = self.watcher()
+        assert watcher.poll() is True
+        first = self.output()['clusters'][0]
+
+        self.capture("b.json", 2)
+        assert watcher.poll() is True
+        assert watcher.converter.loaded == ["a.json", "b.json"]
+        clusters = self.output()['clusters']
+        assert [c['name'] for c in clusters] == ["Cluster1", "Cluster2"]
+        assert clusters[0]['id'] == first['id']
+
+        path = os.path.join(self.input_dir, "a.json")
+        os.utime(path, None)
+        self.clock.now += 10
+        assert watcher.poll() is False
+        assert watcher.converter.loaded == ["a.json", "b.json"]
+
+        os.remove(path)
+        assert watcher.poll() is True
+        assert [c['name'] for c in self.output()['clusters']] == ["Cluster1"]
+        assert sorted(os.listdir(self.work_dir)) == ["drop", "out.json"]
+
+    def test_2(self):
+        path = os.path.join(self.input_dir, "a.json")
+        payload = json.dumps(CaptureGenerator(CaptureSpec(seed=3)).generate())
+        with open(path, 'w') as partial:
+            partial.write(payload[:len(payload) // 2])
+        watcher = self.watcher()
+        assert watcher.poll() is False
+        self.clock.now += 2
+        with open(path, 'w') as complete:
+            complete.write(payload)
+        self.clock.now += 4
+        assert watcher.poll() is False
+        assert watcher.converter.loaded == []
+        self.clock.now += 5
+        assert watcher.poll() is True
+        assert watcher.converter.loaded == ["a.json"]
+
+    def test_3(self):
+        for n in range(3):
+            self.capture(f"node{n}.json", n)
+        watcher = self.watcher(combine=True)
+        for seed in range(3):
+            self.capture("extra.json", 9 + seed)
+            assert watcher.poll() is True
+        expected = convert([self.input_dir], ConvertOptions(combine=True))
+        assert self.output()['clusters'][0]['services'] == expected['clusters'][0]['services']
+
+    def test_4(self):
+        path = self.capture("a.json", 1)
+        for combine in (False, True):
+            self.capture("a.json", 1)
+            watcher = self.watcher(combine=combine)
+            assert watcher.poll() is True
+            good = self.output()
+            with open(path, 'r') as input_file:
+                capture = json.load(input_file)
+            for record in capture["indexes"]:
+                record["key_size_distribution"] = "{bad"
+            with open(path, 'w') as output_file:
+                json.dump(capture, output_file)
+            self.clock.now += 10
+            assert watcher.poll() is False
+            assert self.output() == good
+            self.capture("b.json", 2)
+            assert watcher.poll() is True
+            assert len(self.output()['clusters']) == (1 if combine else 2)
+            os.remove(os.path.join(self.input_dir, "b.json"))
+
+    def test_5(self):
+        self.capture("a.json", 1)
+        output_file = os.path.join(self.input_dir, "sizing.json")
+        watcher = self.watcher(output_file=output_file)
+        assert watcher.poll() is True
+        with open(os.path.join(self.input_dir, "sizing.profile.json"), 'w') as profile_file:
+            json.dump(self.output_json(output_file), profile_file)
+        for _ in range(3):
+            self.clock.now += 10
+            assert watcher.poll() is False
+        assert watcher.converter.loaded == ["a.json"]
+        assert list(watcher.files) == [os.path.join(self.input_dir, "a.json")]
+
+    @staticmethod
+    def output_json(file_name: str) -> dict:
+        with open(file_name, 'r') as output_file:
+            return json.load(output_file)
+
+    def test_7(self):
+        for n in range(3):
+            capture = CaptureGenerator(CaptureSpec(buckets=2, seed=n)).generate()
+            del capture["collections"], capture["indexes"]
+            path = os.path.join(self.input_dir, f"node{n}.json")
+            with open(path, 'w') as output_file:
+                json.dump(capture, output_file)
+            stamp = time.time() - 60
+            os.utime(path, (stamp, stamp))
+        watcher = self.watcher(combine=True)
+        assert watcher.poll() is True
+        expected = convert([self.input_dir], ConvertOptions(combine=True))
+        assert self.output()['clusters'][0]['services'] == expected['clusters'][0]['services']
+        self.clock.now += 10
+        self.capture("extra.json", 9)
+        assert watcher.poll() is True
+        expected = convert([self.input_dir], ConvertOptions(combine=True))
+        assert self.output()['clusters'][0]['services'] == expected['clusters'][0]['services']
+
+    def test_6(self):
+        capture = CaptureGenerator(CaptureSpec(nodes=2, indexes=2, partitions=2, seed=4)).generate()
+        for record in capture["indexes"]:
+            record["partitioned"] = "yes"
+        document = convert([capture], ConvertOptions(validate=ValidateMode.OFF, threads=1))
+        assert len(document['clusters'][0]['services']['index']['indexes']) == 2 * 2 * 4 * 2
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+import shutil
+import tempfile
+from cbsizerhelper.lib.exceptions import FatalError, InputFileReadError
+from cbsizerhelper.lib.fleet import FleetManifest, FleetJournal, FleetRunner
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+
+warnings.filterwarnings("ignore")
+
+
+class TestFleet(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.work_dir, "in"))
+        for n in range(6):
+            CaptureGenerator(CaptureSpec(buckets=1, seed=n)).write(os.path.join(self.work_dir, "in", f"c{n}.json"))
+        with open(os.path.join(self.work_dir, "in", "broken.json"), 'w') as broken:
+            broken.write('{"data": [')
+        jobs = [{"id": f"c{n}", "input": f"in/c{n}.json", "options": {"cloud": "gcp"}} for n in range(6)]
+        jobs.append({"id": "broken", "input": "in/broken.json"})
+        jobs.append({"id": "both", "input": ["in/c0.json", "in/c1.json"], "options": {"combine": True}})
+        self.manifest_data = {"output_dir": "out", "defaults": {"name": "Fleet"}, "jobs": jobs}
+        self.journal_file = os.path.join(self.work_dir, "fleet.journal")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def manifest(self) -> FleetManifest:
+        return FleetManifest.from_config(self.manifest_data, self.work_dir)
+
+    def test_1(self):
+        with self.assertRaises(InputFileReadError) as context:
+            raise InputFileReadError("unreadable")
+        assert context.exception.message == "unreadable"
+        assert isinstance(context.exception, FatalError)
+
+    def test_2(self):
+        progress = FleetRunner(self.manifest(), FleetJournal(self.journal_file), workers=2).run()
+        assert (progress.completed, progress.failed, progress.skipped) == (7, 1, 0)
+        assert progress.errors[0]['id'] == "broken"
+        assert "broken.json" in progress.errors[0]['error']
+        with open(os.path.join(self.work_dir, "out", "c3.json"), 'r') as output_file:
+            cluster = json.load(output_file)['clusters'][0]
+        assert cluster['name'] == "Fleet1"
+        assert cluster['cloud_provider'] == "gcp"
+        with open(self.journal_file, 'r') as journal_file:
+            assert len(journal_file.readlines()) == 8
+
+    def test_3(self):
+        manifest = self.manifest()
+        journal = FleetJournal(self.journal_file)
+        for job in manifest.jobs[:3]:
+            journal.record({"id": job.id, "digest": job.digest, "status": "ok", "output": job.output})
+        os.makedirs(os.path.join(self.work_dir, "out"))
+        for job in manifest.jobs[:2]:
+            open(job.output, 'w').close()
+        with open(self.journal_file, 'a') as journal_file:
+            journal_file.write('{"id": "c3", "dig')
+
+        progress = FleetRunner(manifest, FleetJournal(self.journal_file), workers=1).run()
+        assert (progress.completed, progress.failed, progress.skipped) == (5, 1, 2)
+        assert len(FleetJournal(self.journal_file).entries) == 8
+
+        self.manifest_data['jobs'][0]['options'] = {"cloud": "azure"}
+        progress = FleetRunner(self.manifest(), FleetJournal(self.journal_file), workers=1, retry_failed=False).run()
+        assert (progress.completed, progress.failed, progress.skipped) == (1, 0, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import sys
+import logging
+import subprocess
+import tempfile
+import threading
+import multiprocessing
+from cbsizerhelper.lib.logging import CustomLogFormatter, BackgroundLogWriter, ProgressReporter
+
+warnings.filterwarnings("ignore")
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def log_in_child(logger_name: str, result, writer: BackgroundLogWriter):
+    logging.getLogger(logger_name).warning("from child %d", os.getpid())
+    writer.stop()
+    result.put(threading.active_count())
+
+
+class TestLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger("cbsizerhelper.test_15")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.handler = ListHandler()
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_1(self):
+        formatter = CustomLogFormatter()
+        record = logging.LogRecord("test", logging.WARNING, __file__, 1, "value %d", (42,), None)
+        self.assertIn("[WARNING]", formatter.format(record))
+        self.assertIn("value 42", formatter.format(record))
+        self.assertEqual(len(formatter.formatters), 5)
+
+    def test_2(self):
+        progress = ProgressReporter(self.logger)
+        for n in range(3):
+            progress.item("indexes", "Adding index %d", n)
+        progress.report()
+        self.assertEqual([r.getMessage() for r in self.handler.records], ["Adding index 0", "Adding index 1", "Adding index 2"])
+
+    def test_3(self):
+        progress = ProgressReporter(self.logger, summary=True, interval=3600.0)
+        for n in range(1000):
+            progress.item("keyspaces", "Adding keyspace %d", n)
+            progress.item("indexes", "Adding index %d", n)
+        self.assertEqual(self.handler.records, [])
+        progress.report()
+        self.assertEqual([r.getMessage() for r in self.handler.records], ["Progress: 1000 keyspaces, 1000 indexes"])
+
+    def test_4(self):
+        progress = ProgressReporter(self.logger, summary=True, interval=0.0)
+        for n in range(600):
+            progress.item("indexes", "Adding index %d", n)
+        self.assertEqual([r.getMessage() for r in self.handler.records], ["Progress: 256 indexes", "Progress: 512 indexes"])
+
+    def test_5(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = os.path.join(temp_dir, "test.log")
+            file_handler = logging.FileHandler(log_file, mode="w")
+            file_handler.setFormatter(CustomLogFormatter())
+            writer = BackgroundLogWriter(file_handler).start()
+            self.logger.addHandler(writer.queue_handler)
+            try:
+                for n in range(100):
+                    self.logger.debug("line %d of %s", n, "test")
+            finally:
+                self.logger.removeHandler(writer.queue_handler)
+                writer.stop()
+                file_handler.close()
+            with open(log_file) as log:
+                lines = log.read().splitlines()
+            self.assertEqual(len(lines), 100)
+            self.assertTrue(lines[-1].endswith("line 99 of test"))
+            self.assertIn("(MainThread)", lines[0])
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "requires fork")
+    def test_6(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = os.path.join(temp_dir, "test.log")
+            file_handler = logging.FileHandler(log_file, mode="w")
+            file_handler.setFormatter(CustomLogFormatter())
+            writer = BackgroundLogWriter(file_handler).start()
+            self.logger.addHandler(writer.queue_handler)
+            context = multiprocessing.get_context("fork")
+            result = context.SimpleQueue()
+            try:
+                self.logger.info("from parent")
+                child = context.Process(target=log_in_child, args=(self.logger.name, result, writer))
+                child.start()
+                child.join()
+                threads = result.get()
+                self.logger.info("parent again")
+            finally:
+                self.logger.removeHandler(writer.queue_handler)
+                writer.stop()
+                file_handler.close()
+            with open(log_file) as log:
+                lines = log.read().splitlines()
+            self.assertEqual(child.exitcode, 0)
+            self.assertEqual(threads, 1)
+            self.assertEqual(len(lines), 3, lines)
+            self.assertTrue(any(f"from child {child.pid}" in line for line in lines))
+            self.assertIsNone(BackgroundLogWriter.active)
+
+    def test_7(self):
+        code = "import cbsizerhelper.lib.logging as L; print(L.BackgroundLogWriter.fork_hook)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
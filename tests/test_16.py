@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+import shutil
+import tempfile
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from cbsizerhelper.lib.output import SizingDocumentWriter, write_atomic
+from cbsizerhelper.lib.sizing import SizingConfig
+
+warnings.filterwarnings("ignore")
+
+
+class TestOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.work_dir, "out.json")
+        self.captures = [CaptureGenerator(CaptureSpec(buckets=2, seed=n)).generate() for n in range(3)]
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def stream(self, clusters: list[dict], compact: bool = False) -> tuple[dict, str]:
+        header = SizingConfig.build().as_dict
+        with SizingDocumentWriter(header, self.output_file, compact) as writer:
+            for cluster in clusters:
+                writer.cluster(cluster)
+        with open(self.output_file, 'r') as output_file:
+            return dict(header, clusters=clusters), output_file.read()
+
+    def test_1(self):
+        clusters = list(SizingConverter(ConvertOptions(threads=1)).clusters(self.captures))
+        assert [c['name'] for c in clusters] == ["Cluster1", "Cluster2", "Cluster3"]
+        document, text = self.stream(clusters)
+        assert text == json.dumps(document, indent=2) + "\n"
+        document, text = self.stream(clusters, compact=True)
+        assert text == json.dumps(document, separators=(",", ":")) + "\n"
+        assert "\n" not in text.rstrip("\n")
+
+    def test_2(self):
+        for compact in (False, True):
+            document, text = self.stream([], compact)
+            assert json.loads(text) == document
+
+    def test_3(self):
+        write_atomic({"previous": True}, self.output_file)
+        clusters = SizingConverter(ConvertOptions(threads=1)).clusters(self.captures)
+        with self.assertRaises(RuntimeError):
+            with SizingDocumentWriter(SizingConfig.build().as_dict, self.output_file) as writer:
+                for count, cluster in enumerate(clusters):
+                    if count == 2:
+                        raise RuntimeError("interrupted")
+                    writer.cluster(cluster)
+        with open(self.output_file, 'r') as output_file:
+            assert json.load(output_file) == {"previous": True}
+        assert os.listdir(self.work_dir) == ["out.json"]
+
+    def test_4(self):
+        options = ConvertOptions(jobs=2, threads=1)
+        streamed = [c['name'] for c in SizingConverter(options).clusters(self.captures)]
+        document = SizingConverter(options).convert(self.captures)
+        assert streamed == [c['name'] for c in document['clusters']]
+        assert len(streamed) == 3
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import json
+from cbsizerhelper.lib import codec
+from cbsizerhelper.lib.codec import CODECS, get_codec, set_default_codec, ensure_ascii
+from cbsizerhelper.lib.convert import ConvertOptions, convert
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+
+warnings.filterwarnings("ignore")
+
+
+class TestCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.backends = [get_codec(name) for name, codec_class in CODECS.items() if codec_class.available()]
+        self.reference = get_codec("stdlib")
+
+    def tearDown(self):
+        set_default_codec("auto")
+
+    def test_1(self):
+        capture = CaptureGenerator(CaptureSpec(buckets=2, seed=3)).generate()
+        document = convert([capture], ConvertOptions(threads=1))
+        text = json.dumps(capture)
+        for backend in self.backends:
+            assert backend.loads(text) == capture
+            assert backend.loads(text.encode()) == capture
+            assert backend.dumps(document) == self.reference.dumps(document)
+            assert backend.dumps(document, compact=True) == self.reference.dumps(document, compact=True)
+
+    def test_2(self):
+        data = {"name": "bücket 😀\x7f", "control": "\x00\b\f\n", "empty": {}, "list": [[], {}], "big": 2 ** 70, "ratio": 0.25}
+        for backend in self.backends:
+            assert backend.dumps(data) == json.dumps(data, indent=2)
+            assert backend.dumps(data, compact=True) == json.dumps(data, separators=(",", ":"))
+            assert backend.loads(json.dumps(data)) == data
+        assert ensure_ascii('"é"') == '"\\u00e9"'
+
+    def test_3(self):
+        assert get_codec("stdlib").name == "stdlib"
+        assert get_codec("auto").name == next(name for name, codec_class in CODECS.items() if codec_class.available())
+        with self.assertRaises(ValueError):
+            get_codec("simplejson")
+        for name, codec_class in CODECS.items():
+            if not codec_class.available():
+                with self.assertRaises(ValueError):
+                    get_codec(name)
+        assert set_default_codec("stdlib").name == "stdlib"
+        assert codec.dumps({"a": 1}) == '{\n  "a": 1\n}'
+        with self.assertRaises(ValueError):
+            codec.loads("{not json")
+
+    def test_4(self):
+        data = {"nan": float("nan"), "inf": [float("inf"), -float("inf")], "nested": {"ratio": 1.5, "bad": (float("nan"),)}}
+        expected = '{"nan":null,"inf":[null,null],"nested":{"ratio":1.5,"bad":[null]}}'
+        capture = CaptureGenerator(CaptureSpec(buckets=1, seed=5)).generate()
+        document = convert([capture], ConvertOptions(threads=1))
+        document["clusters"][0]["services"]["data"]["buckets"][0]["in_memory_compression_ratio"] = float("nan")
+        reference = self.reference.dumps(document)
+        assert "NaN" not in reference
+        for backend in self.backends:
+            assert backend.dumps(data, compact=True) == expected, backend.name
+            assert json.loads(backend.dumps(data)) == json.loads(expected)
+            assert backend.dumps(document) == reference, backend.name
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+import shutil
+import tempfile
+from cbsizerhelper.lib.aggregate import KeyspaceAggregate, IndexReplicaMap
+from cbsizerhelper.lib.columnar import ColumnarFile, columnar_name
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter
+from cbsizerhelper.lib.exceptions import InputFileReadError
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from cbsizerhelper.lib.sizing import ClusterConfig
+from tests.common import cli_run
+
+warnings.filterwarnings("ignore")
+
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.input_file = os.path.join(self.work_dir, "capture.json")
+        self.spec = CaptureSpec(nodes=3, buckets=2, scopes=2, collections=3, indexes=3, partitions=2, replicas=1)
+        CaptureGenerator(self.spec).write(self.input_file)
+        self.converter = SizingConverter(ConvertOptions(threads=1))
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def export(self) -> str:
+        exported = self.converter.export_columnar([self.input_file])
+        assert exported[0][1] == columnar_name(self.input_file)
+        return exported[0][1]
+
+    @staticmethod
+    def strip_ids(value):
+        if isinstance(value, dict):
+            return {k: TestColumnar.strip_ids(v) for k, v in value.items() if k != "id"}
+        if isinstance(value, list):
+            return [TestColumnar.strip_ids(v) for v in value]
+        return value
+
+    def test_1(self):
+        columnar_file = self.export()
+        assert columnar_file.endswith("capture.cbcol")
+        expected = self.converter.load(self.input_file)
+        config = self.converter.load(columnar_file)
+        assert config.records == {}
+        for section in ("data", "collections", "indexes"):
+            assert config.section(section) == expected.section(section)
+
+    def test_2(self):
+        columnar_file = self.export()
+        expected = self.converter.convert([self.input_file])
+        document = self.converter.convert([columnar_file])
+        assert self.strip_ids(document) == self.strip_ids(expected)
+
+    def test_3(self):
+        expected = self.converter.load(self.input_file)
+        config = ColumnarFile(self.export()).config()
+        assert KeyspaceAggregate.from_columns(config.columnar("collections")) == KeyspaceAggregate.from_config(expected.collections)
+        assert IndexReplicaMap.from_columns(config.columnar("indexes")) == IndexReplicaMap.from_config(expected.indexes)
+        assert config.primary_indexes() == expected.primary_indexes()
+        assert config.count("indexes") == self.spec.index_rows
+        assert config.records == {}
+        assert isinstance(config.columnar("collections").column("bucket").keys(), memoryview)
+
+    def test_4(self):
+        capture = CaptureGenerator(self.spec).generate()
+        capture["data"][0]["cmd_get"] = 1.5
+        capture["data"][1]["cmd_get"] = 2 ** 70
+        del capture["data"][0]["vb_active_itm_memory"]
+        capture["indexes"][0]["where"] = "x > 1"
+        capture["indexes"][1]["where"] = "ünïcode 😀"
+        expected = ClusterConfig.from_config(capture)
+        output_file = os.path.join(self.work_dir, "mixed.cbcol")
+        with open(output_file, 'wb') as columnar:
+            ColumnarFile.write(expected, columnar)
+        config = ColumnarFile(output_file).config()
+        for section in ("data", "collections", "indexes"):
+            assert config.section(section) == expected.section(section)
+        assert type(config.data[0].cmd_get) is float and type(config.data[2].cmd_get) is int
+
+    def test_5(self):
+        columnar_file = self.export()
+        with open(columnar_file, 'rb') as columnar:
+            blob = columnar.read()
+        with open(columnar_file, 'wb') as columnar:
+            columnar.write(blob[:len(blob) // 2])
+        with self.assertRaises(InputFileReadError):
+            self.converter.load(columnar_file)
+
+    def test_7(self):
+        columnar_file = self.export()
+        expected = self.converter.load(self.input_file)
+        with ColumnarFile(columnar_file) as columnar:
+            config = columnar.config()
+        assert columnar.map is None
+        assert config.primary_indexes() == expected.primary_indexes()
+        config = self.converter.load(columnar_file)
+        for section in ("data", "collections", "indexes"):
+            assert config.section(section) == expected.section(section)
+        if os.path.exists("/proc/self/maps"):
+            with open("/proc/self/maps") as maps:
+                assert os.path.realpath(columnar_file) not in maps.read()
+
+    def test_6(self):
+        output_dir = os.path.join(self.work_dir, "columns")
+        output_file = os.path.join(self.work_dir, "out.json")
+        cmd, output = cli_run("create_import", "export-columnar", "-i", self.input_file, "-i", self.input_file + "*", "-o", output_dir)
+        assert cmd == 0
+        assert os.listdir(output_dir) == ["capture.cbcol"]
+        cmd, output = cli_run("create_import", "-i", os.path.join(output_dir, "*.cbcol"), "-o", output_file)
+        assert cmd == 0
+        with open(output_file, 'r') as document:
+            assert len(json.load(document)["clusters"]) == 1
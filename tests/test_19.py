@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+import shutil
+import tempfile
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter
+from cbsizerhelper.lib.exceptions import InputFileProcessError
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+
+warnings.filterwarnings("ignore")
+
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.inputs = []
+        for n in range(4):
+            path = os.path.join(self.work_dir, f"capture{n}.json")
+            CaptureGenerator(CaptureSpec(buckets=n + 1, seed=n)).write(path)
+            self.inputs.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    @staticmethod
+    def strip_ids(value):
+        if isinstance(value, dict):
+            return {k: TestParallel.strip_ids(v) for k, v in value.items() if k != "id"}
+        if isinstance(value, list):
+            return [TestParallel.strip_ids(v) for v in value]
+        return value
+
+    def test_1(self):
+        sequential = SizingConverter(ConvertOptions(threads=1)).convert(self.inputs)
+        parallel = SizingConverter(ConvertOptions(jobs=3, threads=1)).convert(self.inputs)
+        assert [c['name'] for c in parallel['clusters']] == ["Cluster1", "Cluster2", "Cluster3", "Cluster4"]
+        assert self.strip_ids(parallel['clusters']) == self.strip_ids(sequential['clusters'])
+
+    def test_2(self):
+        with open(self.inputs[2], 'r') as input_file:
+            capture = json.load(input_file)
+        for record in capture["indexes"]:
+            record["key_size_distribution"] = "{bad"
+        with open(self.inputs[2], 'w') as output_file:
+            json.dump(capture, output_file)
+        with self.assertRaises(InputFileProcessError) as context:
+            SizingConverter(ConvertOptions(jobs=2, threads=1)).convert(self.inputs)
+        message = str(context.exception)
+        assert "capture2.json" in message
+        assert "invalid size distribution entry" in message
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import unittest
+import time
+import warnings
+from cbsizerhelper.lib.sizing import ClusterConfigCollections, ClusterConfigIndexes
+from cbsizerhelper.lib.aggregate import KeyspaceAggregate, IndexReplicaMap
+from cbsizerhelper.lib.naming import UniqueNames
+from cbsizerhelper.lib.histogram import parse_distribution
+from cbsizerhelper.lib.exceptions import DataError
+
+warnings.filterwarnings("ignore")
+
+
+def collection_rows(buckets: int, scopes: int, collections: int, nodes: int) -> list:
+    rows = []
+    for b in range(buckets):
+        for s in range(scopes):
+            for c in range(collections):
+                for n in range(nodes):
+                    rows.append(ClusterConfigCollections(f"bucket{b}", f"scope{s}", f"collection{c}", f"node{n}", 0, 0, 10, 0, 0, 0))
+    return rows
+
+
+class TestAggregate(unittest.TestCase):
+
+    def test_1(self):
+        rows = [
+            ClusterConfigCollections("a", "s1", "c1", "node1", 0, 0, 10, 0, 0, 0),
+            ClusterConfigCollections("a", "s1", "c1", "node2", 0, 0, 15, 0, 0, 0),
+            ClusterConfigCollections("b", "s1", "c2", "node1", 0, 0, 7, 0, 0, 0),
+        ]
+        keyspaces = KeyspaceAggregate.from_config(rows)
+        assert keyspaces.scopes("a") == ["s1"]
+        assert keyspaces.collections("a", "s1") == [("c1", 25)]
+        assert keyspaces.collections("b", "s1") == [("c2", 7)]
+        assert keyspaces.items("b", "s1", "c1") == 0
+
+    def test_2(self):
+        def elapsed(rows: list) -> float:
+            best = None
+            for _ in range(3):
+                start = time.perf_counter()
+                KeyspaceAggregate.from_config(rows)
+                duration = time.perf_counter() - start
+                best = duration if best is None else min(best, duration)
+            return best
+
+        small = collection_rows(4, 5, 50, 4)
+        large = collection_rows(16, 5, 50, 4)
+        ratio = elapsed(large) / elapsed(small)
+        assert ratio < 8, f"aggregation scaled super-linearly: 4x input took {ratio:.1f}x time"
+
+    def test_3(self):
+        def index(name: str, replica: int, collection: str = "c1") -> ClusterConfigIndexes:
+            return ClusterConfigIndexes("b", "s", collection, name, "", "", "plasma", "", "", False, 0, 1, "", replica, "", 0, 0, "", *([0] * 29))
+
+        rows = [
+            index("idx_a", 0),
+            index("idx_a (replica 1)", 1),
+            index("idx_a (replica 2)", 2),
+            index("idx_ab", 0),
+            index("idx_b", 1, "c2"),
+        ]
+        replica_map = IndexReplicaMap.from_config(rows)
+        assert replica_map.count("b", "s", "c1", "idx_a") == 2
+        assert replica_map.count("b", "s", "c1", "idx_ab") == 0
+        assert replica_map.count("b", "s", "c1", "idx_b") == 0
+        assert replica_map.count("b", "s", "c2", "idx_b") == 1
+
+    def test_4(self):
+        entries = [{"name": n} for n in ["a", "a", "a_1", "b", "a", "#primary", "#primary"]]
+        UniqueNames.build().apply(entries)
+        assert [e["name"] for e in entries] == ["a", "a_1", "a_1_1", "b", "a_2", "#primary", "#primary_1"]
+
+    def test_5(self):
+        text = "(0-64):1048576, (102401-max):0, (1025-4096):0, (257-1024):0, (4097-102400):0, (65-256):10485760"
+        histogram = parse_distribution(text)
+        assert histogram.mode == 256
+        assert histogram.percentile(5) == 64
+        assert histogram.percentile(99) == 256
+        assert 64 < histogram.mean < 256
+        assert parse_distribution(text) is histogram
+        assert parse_distribution("").mode == 64
+        assert parse_distribution("(102401-max):3").mode == 102401
+        with self.assertRaises(DataError):
+            parse_distribution("(0-64):1, __import__('os')")
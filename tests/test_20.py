@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter
+from cbsizerhelper.lib.exceptions import DataError
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from cbsizerhelper.lib.sizing import ClusterConfig
+
+warnings.filterwarnings("ignore")
+
+
+class TestSections(unittest.TestCase):
+
+    def setUp(self):
+        self.capture = CaptureGenerator(CaptureSpec(buckets=2)).generate()
+
+    def test_1(self):
+        converter = SizingConverter(ConvertOptions(threads=1))
+        config = converter.load(self.capture)
+        converter.process(1, [config])
+        assert sorted(config.records) == ["collections", "data", "indexes"]
+        assert len(config.sections["clients"]) == len(self.capture["clients"])
+        assert len(config.sections["timings"]) == len(self.capture["timings"])
+        assert "data" not in config.sections
+
+    def test_2(self):
+        self.capture["collections"][3]["items"] = "many"
+        config = ClusterConfig.from_config(self.capture)
+        for _ in range(2):
+            with self.assertRaises(DataError):
+                config.section("collections")
+        assert len(config.sections["collections"]) == len(self.capture["collections"])
+        assert "collections" not in config.records
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+from cbsizerhelper.lib.exceptions import DataError
+from cbsizerhelper.lib.naming import UniqueNames
+from cbsizerhelper.lib.sizing import ClusterConfigData, SizingClusterBuckets, SizingClusterBucket, SizingClusterScope, SizingClusterCollection
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'sample_data.json')
+
+
+class TestNames(unittest.TestCase):
+
+    def setUp(self):
+        with open(input_path, 'r') as input_file:
+            self.record = ClusterConfigData.from_config(json.load(input_file)["data"][0])
+
+    def collection(self, collection_id: str, name: str, total: int) -> SizingClusterCollection:
+        return SizingClusterCollection.build(collection_id, name, total, self.record, None, None, None, None)
+
+    def test_1(self):
+        buckets = SizingClusterBuckets.build()
+        for n, name in enumerate(["alpha", "beta", "alpha"]):
+            bucket = SizingClusterBucket.build(str(n), name, self.record)
+            scope = SizingClusterScope.build("0", "_default")
+            scope.collection(self.collection("0", "docs", 10 * (n + 1)))
+            scope.collection(self.collection("1", "docs", 99))
+            bucket.scope(scope)
+            buckets.bucket(bucket)
+
+        assert buckets.bucket_exists("beta") and not buckets.bucket_exists("gamma")
+        first = buckets.get_bucket("alpha")
+        assert first.id == "0"
+        scope = first.get_scope("_default")
+        assert scope.get_collection("docs").total_documents_keys == 10
+        assert first.get_scope("missing") is None
+        with self.assertRaises(DataError):
+            buckets.get_bucket("gamma")
+        with self.assertRaises(DataError):
+            scope.get_collection("missing")
+
+        document = buckets.as_dict
+        assert list(document) == ["buckets"]
+        assert [b["name"] for b in document["buckets"]] == ["alpha", "beta", "alpha"]
+        assert "_names" not in document["buckets"][0] and "_names" not in document["buckets"][0]["scopes"][0]
+
+    def test_2(self):
+        entries = [{"name": n} for n in ["a", "a", "a_1", "b", "a"]]
+        UniqueNames.build().apply(entries)
+        assert [e["name"] for e in entries] == ["a", "a_1", "a_1_1", "b", "a_2"]
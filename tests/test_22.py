@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+import shutil
+import tempfile
+import threading
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from cbsizerhelper.lib.profile import PhaseProfiler
+from tests.common import cli_run
+
+warnings.filterwarnings("ignore")
+
+
+class TestProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.input_files = []
+        for n in range(2):
+            input_file = os.path.join(self.work_dir, f"capture{n}.json")
+            CaptureGenerator(CaptureSpec(nodes=2, buckets=2, scopes=1, collections=2, indexes=2, seed=n)).write(input_file)
+            self.input_files.append(input_file)
+        self.output_file = os.path.join(self.work_dir, "output.json")
+        self.profile_file = os.path.join(self.work_dir, "output.profile.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def run_profile(self, threads: int) -> dict:
+        args = ["-o", self.output_file, "--profile", "--threads", str(threads)]
+        for input_file in self.input_files:
+            args.extend(["-i", input_file])
+        cmd, output = cli_run("create_import", *args)
+        assert cmd == 0, output
+        assert os.path.exists(self.profile_file)
+        with open(self.profile_file) as profile_file:
+            return json.load(profile_file)
+
+    def test_1(self):
+        report = self.run_profile(1)
+        phases = report["phases"]
+        assert report["threads"] == 1
+        for name in ("read", "json_decode", "from_config", "write_file"):
+            assert name in phases, name
+        assert phases["read"]["calls"] == 2
+        assert phases["read"]["counts"]["files"] == 2
+        assert phases["read"]["counts"]["bytes"] == sum(os.path.getsize(f) for f in self.input_files)
+        assert phases["from_config"]["calls"] == 2
+        assert phases["write_file"]["counts"]["clusters"] == 2
+        assert phases["read"]["concurrent_calls"] == 0
+        assert phases["json_decode"]["peak_memory"] > 0
+
+    def test_2(self):
+        report = self.run_profile(4)
+        phases = report["phases"]
+        assert report["threads"] == 4
+        assert phases["read"]["calls"] == 2
+        assert phases["from_config"]["counts"]["data"] > 0
+        for record in phases.values():
+            assert 0 <= record["concurrent_calls"] <= record["calls"]
+            if record["concurrent_calls"] == record["calls"]:
+                assert record["peak_memory"] == 0
+
+    def test_3(self):
+        profiler = PhaseProfiler(trace_memory=False)
+        inside = threading.Event()
+        release = threading.Event()
+
+        def worker():
+            with profiler.phase("read"):
+                inside.set()
+                release.wait()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        inside.wait()
+        with profiler.phase("json_decode"):
+            pass
+        release.set()
+        thread.join()
+        with profiler.phase("from_config"):
+            pass
+        assert profiler.phases["read"].concurrent_calls == 1
+        assert profiler.phases["json_decode"].concurrent_calls == 1
+        assert profiler.phases["from_config"].concurrent_calls == 0
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import shutil
+import tempfile
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter
+from cbsizerhelper.lib.exceptions import InputFileReadError
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from tests.common import cli_run
+
+warnings.filterwarnings("ignore")
+
+
+class TestLibraryErrors(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.good_file = os.path.join(self.work_dir, "good.json")
+        self.bad_file = os.path.join(self.work_dir, "bad.json")
+        CaptureGenerator(CaptureSpec(nodes=2, buckets=1, scopes=1, collections=1, indexes=1)).write(self.good_file)
+        with open(self.bad_file, 'w') as bad_file:
+            bad_file.write('{"data": [')
+        with open(self.bad_file.replace(".json", ".json.gz"), 'w') as bad_file:
+            bad_file.write('{"data": [')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_1(self):
+        for threads in (1, 4):
+            converter = SizingConverter(ConvertOptions(threads=threads))
+            try:
+                converter.convert([self.bad_file, self.bad_file.replace(".json", ".json.gz")])
+            except SystemExit:
+                self.fail("convert() exited the process")
+            except InputFileReadError as err:
+                assert self.bad_file in str(err)
+            else:
+                self.fail("convert() accepted a truncated capture")
+
+    def test_2(self):
+        converter = SizingConverter(ConvertOptions(threads=1))
+        clusters = converter.clusters([self.bad_file, self.bad_file + "*"])
+        with self.assertRaises(InputFileReadError):
+            next(clusters)
+        with self.assertRaises(InputFileReadError):
+            converter.export_columnar([self.bad_file], self.work_dir)
+        with self.assertRaises(InputFileReadError):
+            converter.sweep([self.bad_file])
+
+    def test_3(self):
+        cmd, output = cli_run("create_import", "-i", self.bad_file, "-o", os.path.join(self.work_dir, "output.json"))
+        assert cmd == 1
+        assert f"can not read sizing file {self.bad_file}" in output
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import io
+import json
+from cbsizerhelper.lib.stream import JSONStreamReader
+from cbsizerhelper.lib.sizing import ClusterConfig
+from cbsizerhelper.lib.convert import STREAM_SECTIONS
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'sample_data.json')
+
+
+class TestStream(unittest.TestCase):
+
+    def test_1(self):
+        with open(input_path, 'r') as input_file:
+            text = input_file.read()
+        expected = [(k, e) for k, v in json.loads(text).items() for e in v]
+        for chunk_size in (1, 7, 65536):
+            assert list(JSONStreamReader(io.StringIO(text), chunk_size).items()) == expected
+
+    def test_2(self):
+        text = '{"a": 12345, "b": [1, 2.5e3, "x"], "c": []}'
+        assert list(JSONStreamReader(io.StringIO(text), 2).items()) == [('a', 12345), ('b', 1), ('b', 2500.0), ('b', 'x')]
+        with self.assertRaises(ValueError):
+            list(JSONStreamReader(io.StringIO('{"a": [1, 2'), 2).items())
+
+    def test_3(self):
+        with open(input_path, 'r') as input_file:
+            config = ClusterConfig.from_stream(JSONStreamReader(input_file).items(), STREAM_SECTIONS)
+        assert [d.ep_couch_bucket for d in config.data] == ["mybucket totals:"]
+        assert len(config.indexes) == 1
+        assert len(config.clients) == 0
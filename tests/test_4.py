@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+import threading
+import attr
+from cbsizerhelper.lib.sizing import ClusterConfig, ClusterConfigCollections
+from cbsizerhelper.lib.schema import ValidateMode, SectionSchema
+from cbsizerhelper.lib.exceptions import DataError
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'sample_data.json')
+
+
+class TestValidate(unittest.TestCase):
+
+    def setUp(self):
+        with open(input_path, 'r') as input_file:
+            self.data = json.load(input_file)
+
+    def test_1(self):
+        for mode in ValidateMode:
+            config = ClusterConfig.from_config(self.data, mode)
+            assert len(config.data) == 2
+            assert config.indexes[0].indexName == "my_index_idx"
+
+    def test_2(self):
+        self.data["indexes"][0]["partitioned"] = "yes"
+        with self.assertRaises(DataError):
+            _ = ClusterConfig.from_config(self.data, ValidateMode.FULL).indexes
+        config = ClusterConfig.from_config(self.data, ValidateMode.OFF)
+        assert config.indexes[0].partitioned == "yes"
+
+    def test_3(self):
+        indices = SectionSchema.sample(10000)
+        assert indices[0] == 0 and indices[-1] == 9999
+        assert len(indices) <= 258
+
+    def test_4(self):
+        self.data["indexes"] = self.data["indexes"] * 2000
+        done = threading.Event()
+
+        def build():
+            while not done.is_set():
+                _ = ClusterConfig.from_config(self.data, ValidateMode.OFF).indexes
+
+        worker = threading.Thread(target=build)
+        worker.start()
+        try:
+            for _ in range(200):
+                assert attr.validators.get_disabled() is False
+                with self.assertRaises(TypeError):
+                    ClusterConfigCollections("b", "s", "c", "n", "bad", 0, 0, 0, 0, 0)
+        finally:
+            done.set()
+            worker.join()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import logging
+import unittest
+import warnings
+import os
+import json
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from tests.common import cli_run
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'generated_data.json')
+output_path = os.path.join(current, 'pytest_output.json')
+
+
+class TestGenerated(unittest.TestCase):
+    command = None
+
+    def setUp(self):
+        self.command = 'create_import'
+        self.spec = CaptureSpec(nodes=3, buckets=2, scopes=2, collections=3, indexes=3, partitions=2, replicas=1)
+        CaptureGenerator(self.spec).write(input_path)
+
+    def tearDown(self):
+        os.remove(input_path)
+        loggers = [logging.getLogger()] + list(logging.Logger.manager.loggerDict.values())
+        for logger in loggers:
+            handlers = getattr(logger, 'handlers', [])
+            for handler in handlers:
+                logger.removeHandler(handler)
+
+    def test_1(self):
+        capture = CaptureGenerator(self.spec).generate()
+        assert len(capture["collections"]) == self.spec.collection_rows
+        assert len(capture["indexes"]) == self.spec.index_rows
+        assert len([d for d in capture["data"] if d["ep_couch_bucket"].endswith(" totals:")]) == self.spec.buckets
+
+    def test_2(self):
+        args = ["-i", input_path, "-o", output_path]
+        result, output = cli_run(self.command, *args)
+        assert result == 0
+        with open(output_path) as f:
+            data = json.load(f)
+        services = data['clusters'][0]['services']
+        buckets = services['data']['buckets']
+        assert len(buckets) == self.spec.buckets
+        assert all(len(b['scopes']) == self.spec.scopes for b in buckets)
+        assert all(len(s['collections']) == self.spec.collections for b in buckets for s in b['scopes'])
+        indexes = services['index']['indexes']
+        assert len(indexes) == self.spec.buckets * self.spec.scopes * self.spec.collections * self.spec.indexes
+        assert all(i['number_replicas'] == self.spec.replicas for i in indexes)
+        assert len(set(i['name'] for i in indexes)) == len(indexes)
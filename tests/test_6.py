@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter, convert
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'sample_data.json')
+
+
+class TestConvert(unittest.TestCase):
+
+    def test_1(self):
+        document = convert([input_path])
+        assert document['clusters'][0]['services']['data']['buckets'][0]['name'] == 'mybucket'
+
+    def test_2(self):
+        with open(input_path, 'r') as input_file:
+            data = json.load(input_file)
+        snapshot = json.dumps(data, sort_keys=True)
+        options = ConvertOptions(name="Test", cloud="gcp", combine=True)
+        document = convert([data, data], options)
+        assert json.dumps(data, sort_keys=True) == snapshot
+        assert len(document['clusters']) == 1
+        cluster = document['clusters'][0]
+        assert cluster['name'] == "Test1"
+        assert cluster['cloud_provider'] == "gcp"
+        assert [b['name'] for b in cluster['services']['data']['buckets']] == ['mybucket']
+        single = convert([data])['clusters'][0]
+        assert cluster['services']['data'] == single['services']['data']
+
+    def test_3(self):
+        captures = [CaptureGenerator(CaptureSpec(buckets=n + 1, seed=n)).generate() for n in range(4)]
+        converter = SizingConverter(ConvertOptions(validate="sample"))
+        expected = [len(converter.convert([c])['clusters'][0]['services']['data']['buckets']) for c in captures]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda c: converter.convert([c]), captures * 4))
+        assert [len(r['clusters'][0]['services']['data']['buckets']) for r in results] == expected * 4
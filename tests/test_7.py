@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import glob
+import stat
+import tempfile
+from cbsizerhelper.lib.cache import ParseCache, CACHE_KEY_FILE
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'sample_data.json')
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_1(self):
+        converter = SizingConverter(ConvertOptions(cache_dir=self.cache_dir.name))
+        cold = converter.load(input_path)
+        key = converter.cache_key(input_path)
+        warm = converter.cache.get(key)
+        assert warm is not None
+        assert warm.data == cold.data
+        assert warm.indexes == cold.indexes
+
+    def test_2(self):
+        converter = SizingConverter(ConvertOptions(cache_dir=self.cache_dir.name))
+        converter.load(input_path)
+        key = converter.cache_key(input_path)
+        with open(converter.cache.path(key), 'r+b') as cache_file:
+            cache_file.seek(-4, os.SEEK_END)
+            cache_file.write(b"XXXX")
+        assert converter.cache.get(key) is None
+        assert not os.path.exists(converter.cache.path(key))
+
+    def test_3(self):
+        converter = SizingConverter(ConvertOptions(cache_dir=self.cache_dir.name))
+        config = converter.load(input_path)
+        cache = ParseCache(self.cache_dir.name, 1)
+        cache.put("a" * 64, config)
+        cache.put("b" * 64, config)
+        assert [os.path.basename(f) for f in glob.glob(os.path.join(self.cache_dir.name, "*.cache"))] == []
+
+    def test_4(self):
+        cache_dir = os.path.join(self.cache_dir.name, "new")
+        converter = SizingConverter(ConvertOptions(cache_dir=cache_dir))
+        assert stat.S_IMODE(os.stat(cache_dir).st_mode) & 0o077 == 0
+        assert stat.S_IMODE(os.stat(os.path.join(cache_dir, CACHE_KEY_FILE)).st_mode) == 0o600
+        config = converter.load(input_path)
+        key = converter.cache_key(input_path)
+        assert converter.cache.get(key) is not None
+        other = os.path.join(self.cache_dir.name, "other")
+        ParseCache(other).put(key, config)
+        os.replace(ParseCache(other).path(key), converter.cache.path(key))
+        assert converter.cache.get(key) is None
+        assert not os.path.exists(converter.cache.path(key))
+
+    def test_5(self):
+        os.chmod(self.cache_dir.name, 0o777)
+        assert ParseCache.open(self.cache_dir.name) is None
+        converter = SizingConverter(ConvertOptions(cache_dir=self.cache_dir.name))
+        assert converter.cache is None
+        assert converter.load(input_path).data
+        assert glob.glob(os.path.join(self.cache_dir.name, "*")) == []
+        os.chmod(self.cache_dir.name, 0o700)
+        ParseCache(self.cache_dir.name)
+        os.chmod(os.path.join(self.cache_dir.name, CACHE_KEY_FILE), 0o644)
+        assert ParseCache.open(self.cache_dir.name) is None
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+from cbsizerhelper.lib.convert import ConvertOptions, SizingConverter, convert
+from cbsizerhelper.lib.generator import CaptureGenerator, CaptureSpec
+from cbsizerhelper.lib.sweep import ScenarioGrid
+from cbsizerhelper.lib.exceptions import DataError
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'sample_data.json')
+
+
+def strip_ids(cluster: dict) -> dict:
+    cluster.pop('id')
+    cluster.pop('name')
+    for group in cluster['service_groups']:
+        group.pop('id')
+    return cluster
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_1(self):
+        grid = ScenarioGrid.from_config({"bucket_ratio": [20, 50], "cloud": ["aws", "gcp"], "index_ratio": [50]})
+        scenarios = grid.scenarios
+        assert len(scenarios) == 4
+        sweep = SizingConverter().sweep([input_path])
+        for scenario, document in sweep.documents(scenarios):
+            values = scenario.values
+            options = ConvertOptions(cloud=values["cloud"], bucket_ratio=str(values["bucket_ratio"]), index_ratio=str(values["index_ratio"]))
+            expected = convert([input_path], options)
+            assert [strip_ids(c) for c in document['clusters']] == [strip_ids(c) for c in expected['clusters']]
+
+    def test_2(self):
+        capture = CaptureGenerator(CaptureSpec(buckets=3, seed=4)).generate()
+        grid = ScenarioGrid.from_config({"read": [10, 2000], "write": [5.5]})
+        sweep = SizingConverter().sweep([capture])
+        document = sweep.combined(grid.scenarios)
+        assert len(document['clusters']) == 2
+        assert len(set(c['id'] for c in document['clusters'])) == 2
+        for cluster, scenario in zip(document['clusters'], grid.scenarios):
+            expected = convert([capture], ConvertOptions(read=str(scenario.values["read"]), write="5.5"))['clusters'][0]
+            assert strip_ids(cluster) == strip_ids(expected)
+
+    def test_3(self):
+        with self.assertRaises(DataError):
+            ScenarioGrid.from_config({"replicas": [1, 2]})
+        with self.assertRaises(DataError):
+            ScenarioGrid.from_config({"cloud": ["ibm"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import unittest
+import warnings
+import os
+import gzip
+import lzma
+import tempfile
+from cbsizerhelper.lib.convert import ConvertOptions, convert
+from cbsizerhelper.lib.source import SourceFile, Compression, zstandard
+
+warnings.filterwarnings("ignore")
+current = os.path.dirname(os.path.realpath(__file__))
+
+input_path = os.path.join(current, 'sample_data.json')
+
+
+def strip_ids(document: dict) -> list:
+    clusters = document['clusters']
+    for cluster in clusters:
+        cluster.pop('id')
+        for group in cluster['service_groups']:
+            group.pop('id')
+    return clusters
+
+
+class TestSource(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        with open(input_path, 'rb') as input_file:
+            self.raw = input_file.read()
+        self.files = {Compression.none: input_path}
+        for compression, opener in ((Compression.gzip, gzip.open), (Compression.xz, lzma.open)):
+            file_name = os.path.join(self.work_dir.name, f"sample.json.{compression.name}")
+            with opener(file_name, 'wb') as output_file:
+                output_file.write(self.raw)
+            self.files[compression] = file_name
+        if zstandard:
+            file_name = os.path.join(self.work_dir.name, "sample.json.zst")
+            with open(file_name, 'wb') as output_file:
+                output_file.write(zstandard.ZstdCompressor().compress(self.raw))
+            self.files[Compression.zstd] = file_name
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def test_1(self):
+        for compression, file_name in self.files.items():
+            source = SourceFile(file_name)
+            assert source.compression == compression
+            assert source.read_text() == self.raw.decode('utf-8')
+            with source.open_text() as input_file:
+                assert input_file.read() == self.raw.decode('utf-8')
+        assert SourceFile(input_path, mmap_threshold=0).read_text() == self.raw.decode('utf-8')
+
+    def test_2(self):
+        expected = strip_ids(convert([input_path]))
+        for file_name in self.files.values():
+            assert strip_ids(convert([file_name])) == expected
+            assert strip_ids(convert([file_name], ConvertOptions(stream=True))) == expected
+
+
+if __name__ == '__main__':
+    unittest.main()